@@ -1,364 +1,139 @@
 import streamlit as st
+import importlib.util
+import os
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import itertools
-import random
+import time
+import uuid
+import warnings
+
+from yard_sim.cache import SimulationCache, simulation_key
+from yard_sim.checkpoints import SimulationCheckpoints
+from yard_sim.export import export_file, result_tables
+from yard_sim.jobs import DONE, FAILED, STATUS_LABELS, JobLimitError, JobManager
+from yard_sim.layouts import DEFAULT_TERMINAL, default_layout, read_layouts_bytes
+from yard_sim.montecarlo import run_monte_carlo
+from yard_sim.placement import PLACEMENT_SCORE_LABELS
+from yard_sim.profiling import Profiler
+from yard_sim.schedule import read_schedule_bytes, schedule_digest
+from yard_sim.simulation import (
+    EMERGENCY_RULE_LEVEL, EMERGENCY_RULE_VALUES, RULE_LEVELS, build_rules, run_simulation
+)
+from yard_sim.sweep import CLUSTER_LOGIC_ORDER, least_relaxed, rule_grid, run_rule_sweep
+from yard_sim.terminals import TERMINAL_COLUMN, run_terminals, terminal_schedule
+from yard_sim.trends import load_trend_matrix
+from yard_sim.viewmodel import YardViewModel
+from yard_sim.whatif import FeasibilityIndex
 
 # ==============================================================================
-# BAGIAN 1: KONFIGURASI GLOBAL & FUNGSI-FUNGSI UTAMA
+# BAGIAN 1: FUNGSI HELPER UI (INTI SIMULASI ADA DI PAKET yard_sim)
 # ==============================================================================
 
-# --- Konfigurasi Default Aplikasi ---
-DEFAULT_YARD_CONFIG = {
-    'A01': 37, 'A02': 37, 'A03': 37, 'A04': 37,
-    'B01': 37, 'B02': 37, 'B03': 37, 'B04': 37, 'B05': 37,
-    'C03': 45, 'C04': 45, 'C05': 45
-}
-DEFAULT_SLOT_CAPACITY = 30
-STACKING_TREND_URL = 'https://github.com/irhassha/Clash_Analyzer/raw/refs/heads/main/stacking_trend.xlsx'
-
 # --- Fungsi Helper untuk Memuat Data ---
 
-@st.cache_data
-def load_stacking_trends(url):
-    """Memuat dan cache data stacking trend dari URL GitHub."""
+@st.cache_resource
+def load_stacking_trends(source):
+    """Memuat matriks stacking trend (file lokal + cache biner) sekali per server."""
     try:
-        df = pd.read_excel(url)
-        df.rename(columns={'STACKING TREND': 'SERVICE'}, inplace=True)
-        return df.set_index('SERVICE')
+        return load_trend_matrix(source)
     except Exception as e:
-        st.error(f"Gagal memuat file stacking trend dari URL: {e}")
+        st.error(f"Gagal memuat file stacking trend: {e}")
         return None
 
-def get_daily_arrivals(total_boxes, service_name, trends_df, num_days):
-    """Menghitung jumlah box harian, menangani kekurangan hari dengan nilai 0."""
-    percentages = []
-    if service_name in trends_df.index:
-        for i in range(num_days):
-            day_col = f'DAY {i}'
-            if day_col in trends_df.columns:
-                percentages.append(trends_df.loc[service_name, day_col])
-            else:
-                percentages.append(0)
-        percentages = np.array(pd.to_numeric(percentages, errors='coerce'))
-    else:
-        st.warning(f"Service '{service_name}' tidak ditemukan. Menggunakan tren rata-rata.")
-        percentages = np.full(num_days, 1.0 / num_days)
-
-    percentages = np.nan_to_num(percentages)
-    if percentages.sum() > 0:
-        percentages = percentages / percentages.sum()
-
-    daily_boxes = np.round(percentages * total_boxes).astype(int)
-    diff = total_boxes - daily_boxes.sum()
-    if diff != 0 and len(daily_boxes) > 0:
-        daily_boxes[np.argmax(daily_boxes)] += diff
-    return daily_boxes
-
-# --- Fungsi Inti Simulasi ("Otak" Aplikasi) ---
-
-def run_simulation(df_schedule, df_trends, rules, rule_level):
-    """Fungsi utama untuk menjalankan seluruh proses simulasi dengan logika nyata."""
-
-    # --- BAGIAN 1: INISIALISASI ---
-    yard_config = DEFAULT_YARD_CONFIG
-    slot_capacity = DEFAULT_SLOT_CAPACITY
-    
-    yard_status = {(area, i): None for area, num_slots in yard_config.items() for i in range(1, num_slots + 1)}
-    
-    offset = 0
-    yard_config_map = {}
-    for area, num_slots in yard_config.items():
-        yard_config_map[area] = {'offset': offset, 'size': num_slots}
-        offset += num_slots
-    
-    def get_slot_index(slot):
-        area, number = slot
-        return yard_config_map[area]['offset'] + number - 1
-
-    vessels = {}
-    for _, row in df_schedule.iterrows():
-        ship_name = row['VESSEL']
-        start_date = row['OPEN STACKING'].normalize()
-        eta_date = row['ETA'] # Simpan ETA dengan waktu
-        etd_date = row['ETD'].normalize()
-        num_days = (etd_date - start_date).days
-        
-        base_avg = 150 if rules['cluster_req_logic'] == 'Wajar' else 100
-        initial_cluster_req = max(1, int(np.ceil(row['TOTAL BOX (TEUS)'] / base_avg)))
-
-        vessels[ship_name] = {
-            'name': ship_name, 'service': row['SERVICE'], 'total_boxes': row['TOTAL BOX (TEUS)'],
-            'start_date': start_date, 'eta_date': eta_date, 'etd_date': etd_date,
-            'daily_arrivals': get_daily_arrivals(row['TOTAL BOX (TEUS)'], row['SERVICE'], df_trends, num_days + 1),
-            'clusters': [[] for _ in range(initial_cluster_req)],
-            'max_clusters': initial_cluster_req + 2,
-            'remaining_capacity': 0 
-        }
-
-    # --- BAGIAN 2: LOGIKA SIMULASI INTI ---
-    daily_log = []
-    yor_data = []
-    daily_yard_snapshots = {} 
-    
-    start_date_sim = df_schedule['OPEN STACKING'].min().normalize()
-    end_date_sim = df_schedule['ETD'].max().normalize()
-    date_range = pd.date_range(start=start_date_sim, end=end_date_sim, freq='D')
-
-    for current_date in date_range:
-        for ship_data in vessels.values():
-            if ship_data['etd_date'].normalize() == (current_date - timedelta(days=1)).normalize():
-                slots_to_free = [slot for cluster in ship_data['clusters'] for slot in cluster]
-                for slot in slots_to_free:
-                    if yard_status.get(slot) == ship_data['name']:
-                        yard_status[slot] = None
-
-        active_ships_today = sorted(
-            [ship for ship in vessels.values() if current_date >= ship['start_date'] and current_date <= ship['etd_date']],
-            key=lambda x: x['total_boxes'], reverse=True
-        )
-        
-        for ship in active_ships_today:
-            day_index = (current_date - ship['start_date']).days
-            boxes_to_allocate_today = 0
-            if day_index < len(ship['daily_arrivals']):
-                boxes_to_allocate_today = ship['daily_arrivals'][day_index]
-            
-            effective_boxes_needed = boxes_to_allocate_today - ship['remaining_capacity']
-            
-            slots_needed = 0
-            slots_allocated_today = []
-            recommendation = "Tidak ada aktivitas penumpukan"
-            boxes_failed_today = 0
-
-            if effective_boxes_needed > 0:
-                ship['remaining_capacity'] = 0
-                slots_needed = int(np.ceil(effective_boxes_needed / slot_capacity))
-                
-                slots_allocated_today, recommendation = allocate_slots_intelligently(
-                    ship, slots_needed, yard_status, vessels, current_date, rules, get_slot_index
-                )
-                
-                newly_allocated_capacity = len(slots_allocated_today) * slot_capacity
-                ship['remaining_capacity'] = newly_allocated_capacity - effective_boxes_needed
-
-                slots_failed = slots_needed - len(slots_allocated_today)
-                if slots_failed > 0 and slots_needed > 0:
-                    boxes_per_needed_slot = effective_boxes_needed / slots_needed
-                    boxes_failed_today = int(np.round(slots_failed * boxes_per_needed_slot))
-
-            elif boxes_to_allocate_today > 0:
-                ship['remaining_capacity'] = abs(effective_boxes_needed)
-                recommendation = f"Menggunakan sisa kapasitas. Sisa: {ship['remaining_capacity']} box."
-
-            daily_log.append({
-                'Tanggal': current_date.strftime('%Y-%m-%d'), 'Kapal': ship['name'],
-                'Butuh Box': boxes_to_allocate_today,
-                'Butuh Slot': slots_needed, 'Slot Berhasil': len(slots_allocated_today),
-                'Slot Gagal': slots_needed - len(slots_allocated_today),
-                'Box Gagal Harian': boxes_failed_today,
-                'Rekomendasi': recommendation
-            })
-        
-        occupied_slots = sum(1 for status in yard_status.values() if status is not None)
-        total_slots = len(yard_status)
-        yor_data.append({
-            'Tanggal': current_date,
-            'Total Box di Yard': occupied_slots * slot_capacity,
-            'Rasio Okupansi (%)': (occupied_slots / total_slots) * 100
-        })
-        daily_yard_snapshots[current_date] = yard_status.copy()
-        
-    # --- BAGIAN 3: AGREGASI & PERSIAPAN OUTPUT ---
-    df_daily_log = pd.DataFrame(daily_log)
-    df_yor = pd.DataFrame(yor_data)
-
-    recap_list = []
-    for ship in vessels.values():
-        total_requested = ship['total_boxes']
-        
-        total_boxes_failed = df_daily_log[df_daily_log['Kapal'] == ship['name']]['Box Gagal Harian'].sum()
-        boxes_successful = total_requested - total_boxes_failed
-        
-        recap_list.append({
-            'Kapal': ship['name'], 'Permintaan Box': total_requested,
-            'Box Berhasil': boxes_successful,
-            'Box Gagal': total_boxes_failed
-        })
-    df_recap = pd.DataFrame(recap_list)
-
-    map_list = []
-    for ship in vessels.values():
-        for i, cluster in enumerate(ship['clusters']):
-            if not cluster: continue
-            
-            cluster.sort(key=get_slot_index)
-            groups = []
-            for k, g in itertools.groupby(enumerate(cluster), lambda item: get_slot_index(item[1]) - item[0]):
-                group = list(item[1] for item in g)
-                start_slot_obj = group[0]
-                end_slot_obj = group[-1]
-                
-                if start_slot_obj == end_slot_obj:
-                    groups.append(f"{start_slot_obj[0]}:{start_slot_obj[1]}")
-                else:
-                    groups.append(f"{start_slot_obj[0]}:{start_slot_obj[1]}-{end_slot_obj[1]}")
-            
-            map_list.append({
-                'Kapal': ship['name'], 'Cluster': f'Cluster {i+1}',
-                'Lokasi & Slot': ", ".join(groups)
-            })
-    df_map = pd.DataFrame(map_list)
-
-    return df_yor, df_recap, df_map, df_daily_log, daily_yard_snapshots, vessels
-
-def find_placeable_slots(current_ship, all_ships, yard_status, current_date, rules):
-    free_slots = {slot for slot, owner in yard_status.items() if owner is None}
-    blocked_slots = set()
-    
-    active_ships = [ship for ship in all_ships.values() if current_date >= ship['start_date'] and current_date <= ship['etd_date']]
-    
-    ignored_vessels = rules.get('ignored_vessels', [])
-
-    for ship in active_ships:
-        if ship['name'] == current_ship['name'] or ship['name'] in ignored_vessels:
-            continue
-        
-        operational_start_time = ship['eta_date'] - timedelta(hours=8)
-        if datetime.combine(current_date, datetime.min.time()) < operational_start_time:
-            continue
-            
-        etd_diff = abs((current_ship['etd_date'] - ship['etd_date']).days)
-        
-        for cluster in ship['clusters']:
-            if not cluster: continue
-            
-            cluster_area = cluster[0][0]
-            area_size = DEFAULT_YARD_CONFIG[cluster_area]
-            min_slot_num = min(s[1] for s in cluster)
-            max_slot_num = max(s[1] for s in cluster)
-            
-            start_zone = max(1, min_slot_num - rules['daily_exclusion_zone'])
-            end_zone = min(area_size, max_slot_num + rules['daily_exclusion_zone'])
-            for i in range(start_zone, end_zone + 1):
-                blocked_slots.add((cluster_area, i))
-
-            if etd_diff <= 1:
-                start_gap = max(1, min_slot_num - rules['inter_ship_gap'])
-                end_gap = min(area_size, max_slot_num + rules['inter_ship_gap'])
-                for i in range(start_gap, end_gap + 1):
-                    blocked_slots.add((cluster_area, i))
-
-    placeable_slots = free_slots - blocked_slots
-    
-    offset = 0
-    temp_map = {}
-    for area, num_slots in DEFAULT_YARD_CONFIG.items():
-        temp_map[area] = {'offset': offset}; offset += num_slots
-    def get_slot_idx_local(slot):
-        return temp_map[slot[0]]['offset'] + slot[1] - 1
-        
-    return sorted(list(placeable_slots), key=get_slot_idx_local)
-
-
-def allocate_slots_intelligently(ship, slots_needed, yard_status, vessels, current_date, rules, get_slot_index_func):
-    placeable_slots = find_placeable_slots(ship, vessels, yard_status, current_date, rules)
-    if len(placeable_slots) < slots_needed:
-        return [], "Gagal: Tidak cukup slot valid yang tersedia (terblokir kapal lain)."
-
-    def format_slot_list_to_string(slot_list):
-        if not slot_list: return ""
-        start = slot_list[0]; end = slot_list[-1]
-        return f"{start[0]}:{start[1]}" if start == end else f"{start[0]}:{start[1]}-{end[1]}"
-
-    for i, cluster in enumerate(ship['clusters']):
-        if not cluster: continue
-        cluster.sort(key=get_slot_index_func)
-        first_slot_idx = get_slot_index_func(cluster[0])
-        last_slot_idx = get_slot_index_func(cluster[-1])
-        
-        placeable_indices = {get_slot_index_func(s) for s in placeable_slots}
-        
-        expansion_indices_before = set(range(first_slot_idx - slots_needed, first_slot_idx))
-        if expansion_indices_before.issubset(placeable_indices):
-            slots_to_fill = sorted([s for s in placeable_slots if get_slot_index_func(s) in expansion_indices_before], key=get_slot_index_func)
-            ship['clusters'][i] = slots_to_fill + ship['clusters'][i]
-            for slot in slots_to_fill: yard_status[slot] = ship['name']
-            return slots_to_fill, f"Perluas Cluster #{i+1}, target: {format_slot_list_to_string(slots_to_fill)}"
-        
-        expansion_indices_after = set(range(last_slot_idx + 1, last_slot_idx + 1 + slots_needed))
-        if expansion_indices_after.issubset(placeable_indices):
-            slots_to_fill = sorted([s for s in placeable_slots if get_slot_index_func(s) in expansion_indices_after], key=get_slot_index_func)
-            ship['clusters'][i].extend(slots_to_fill)
-            for slot in slots_to_fill: yard_status[slot] = ship['name']
-            return slots_to_fill, f"Perluas Cluster #{i+1}, target: {format_slot_list_to_string(slots_to_fill)}"
-
-    placeable_slots_by_area = {}
-    for slot in placeable_slots:
-        area = slot[0]
-        if area not in placeable_slots_by_area: placeable_slots_by_area[area] = []
-        placeable_slots_by_area[area].append(slot)
-
-    placeable_blocks = []
-    for area, slots in placeable_slots_by_area.items():
-        slots.sort(key=lambda s: s[1])
-        for k, g in itertools.groupby(enumerate(slots), lambda item: item[1][1] - item[0]):
-             placeable_blocks.append([item[1] for item in g])
-
-    valid_blocks = [block for block in placeable_blocks if len(block) >= slots_needed]
-    if not valid_blocks:
-        return [], "Gagal: Tidak ada blok tunggal yang cukup besar."
-
-    final_valid_blocks = []
-    for block in valid_blocks:
-        is_valid_distance = True
-        block_start_idx = get_slot_index_func(block[0])
-        block_end_idx = get_slot_index_func(block[slots_needed-1])
-        for existing_cluster in ship['clusters']:
-            if not existing_cluster: continue
-            existing_cluster.sort(key=get_slot_index_func)
-            existing_start_idx = get_slot_index_func(existing_cluster[0])
-            existing_end_idx = get_slot_index_func(existing_cluster[-1])
-            
-            if block[0][0] == existing_cluster[0][0]:
-                distance = max(existing_start_idx - block_end_idx, block_start_idx - existing_end_idx) - 1
-                if distance < rules['intra_ship_gap']:
-                    is_valid_distance = False
-                    break
-        if is_valid_distance:
-            final_valid_blocks.append(block)
-
-    if not final_valid_blocks:
-        return [], "Gagal: Blok tersedia melanggar jarak internal."
-
-    # --- PERBAIKAN: Logika Pemilihan Blok "Best-Fit" & Acak ---
-    min_size = min(len(b) for b in final_valid_blocks)
-    best_fit_blocks = [b for b in final_valid_blocks if len(b) == min_size]
-    random.shuffle(best_fit_blocks) # Acak kandidat terbaik untuk menyebar
-    best_block = best_fit_blocks[0]
-    slots_to_fill = best_block[:slots_needed]
-    # --- AKHIR PERBAIKAN ---
-
-    target_cluster_idx = -1
-    for i, cluster in enumerate(ship['clusters']):
-        if not cluster:
-            target_cluster_idx = i
-            break
-    
-    if target_cluster_idx == -1:
-        if len(ship['clusters']) < ship['max_clusters']:
-            ship['clusters'].append([])
-            target_cluster_idx = len(ship['clusters']) - 1
-            recommendation = f"Buat Cluster Tambahan #{len(ship['clusters'])}, target: {format_slot_list_to_string(slots_to_fill)}"
+@st.cache_data(max_entries=8, show_spinner="Membaca file jadwal...")
+def load_schedule(digest, name, _data):
+    """Parse + normalisasi jadwal sekali per isi file (kunci: hash bytes, bukan nama file)."""
+    return read_schedule_bytes(_data, name)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_layouts(digest, name, _data):
+    """Layout terminal dari file upload (kunci: hash isi file)."""
+    return read_layouts_bytes(_data, name)
+
+# Cache hasil di disk bertahan setelah restart; set YARD_SIM_CACHE_DIR="" untuk hanya memakai memori.
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.yard_sim_cache')
+
+@st.cache_resource
+def get_simulation_cache():
+    """Cache hasil simulasi yang dipakai bersama oleh semua sesi."""
+    cache_dir = os.environ.get('YARD_SIM_CACHE_DIR', DEFAULT_CACHE_DIR)
+    return SimulationCache(cache_dir=cache_dir or None)
+
+@st.cache_resource
+def get_job_manager():
+    """Worker pool simulasi bersama; batas dapat diatur lewat YARD_SIM_MAX_JOBS & YARD_SIM_JOBS_PER_USER."""
+    return JobManager(
+        max_workers=int(os.environ.get('YARD_SIM_MAX_JOBS') or 2),
+        max_jobs_per_owner=int(os.environ.get('YARD_SIM_JOBS_PER_USER') or 1),
+    )
+
+def unknown_service_warnings(df_schedule, trends):
+    """Peringatan service tanpa stacking trend (simulasi di job tidak bisa menampilkannya ke UI)."""
+    return [f"Service '{service}' tidak ditemukan. Menggunakan tren rata-rata."
+            for service in df_schedule['SERVICE'] if service not in trends]
+
+def export_bytes(results, fmt, include_occupancy):
+    """Isi file export untuk diunduh; dibangun per chunk di file sementara lalu dibaca sekali."""
+    with export_file(result_tables(results, include_occupancy), fmt) as f:
+        return f.read()
+
+def run_with_warnings(func, *args, **kwargs):
+    """Menjalankan fungsi inti simulasi dan menampilkan peringatannya di UI."""
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        result = func(*args, **kwargs)
+    for warning in caught:
+        st.warning(str(warning.message))
+    return result
+
+def store_simulation_results(results, rules, profile=None):
+    """Menyimpan hasil simulasi di sesi beserta view-model tampilan harian (dibangun sekali)."""
+    _, _, _, df_daily_log, daily_snapshots, vessels_data = results
+    st.session_state['simulation_results'] = results
+    st.session_state['simulation_rules'] = rules
+    st.session_state['yard_view'] = YardViewModel(daily_snapshots, vessels_data, df_daily_log)
+    st.session_state['feasibility'] = None
+    st.session_state['profile'] = profile
+
+@st.fragment(run_every=1.0)
+def show_simulation_job():
+    """Progress job simulasi sesi ini; hasil diambil dan halaman dimuat ulang saat job selesai."""
+    job_info = st.session_state['simulation_job']
+    manager = get_job_manager()
+    job = manager.get(job_info['id'])
+    if job is not None and not job.finished:
+        day, num_days = job.progress
+        st.progress(job.fraction, text=(
+            f"{STATUS_LABELS[job.status]}: hari {day}/{num_days} ({job.elapsed():.0f} detik). "
+            f"{len(manager.active())} simulasi aktif di server."
+        ))
+        if st.button("⛔ Batalkan Simulasi"):
+            job.cancel()
+        return
+
+    st.session_state['simulation_job'] = None
+    notices = [('warning', message) for message in job_info['warnings']]
+    if job is None:
+        notices.append(('error', "Job simulasi tidak ditemukan (server dimulai ulang?)."))
+    elif job.status == DONE:
+        profiler = job_info['profiler']
+        if profiler is not None:
+            with profiler.phase('view_model'):
+                store_simulation_results(job.result, job_info['rules'], profiler)
         else:
-            return [], "Gagal: Batas maksimal cluster tercapai."
+            store_simulation_results(job.result, job_info['rules'])
+        checkpoints = st.session_state['checkpoints']
+        if checkpoints.last_start_day:
+            resumed_date = job.result[0]['Tanggal'].iloc[checkpoints.last_start_day]
+            notices.append(('info', f"Simulasi dilanjutkan dari checkpoint {resumed_date.strftime('%d %b %Y')} (hari sebelumnya tidak berubah)."))
+        notices.append(('success', f"Simulasi Selesai! Dijalankan menggunakan **{job.label}** ({job.elapsed():.1f} detik)."))
+    elif job.status == FAILED:
+        notices.append(('error', f"Terjadi kesalahan saat simulasi: {job.error}"))
     else:
-        recommendation = f"Isi Cluster #{target_cluster_idx + 1}, target: {format_slot_list_to_string(slots_to_fill)}"
-
-    ship['clusters'][target_cluster_idx].extend(slots_to_fill)
-    for slot in slots_to_fill: yard_status[slot] = ship['name']
-    return slots_to_fill, recommendation
+        notices.append(('info', "Simulasi dibatalkan."))
+    if job is not None:
+        manager.discard(job.id)
+    st.session_state['simulation_notices'] = notices
+    st.rerun()
 
 # ==============================================================================
 # BAGIAN 2: UI (ANTARMUKA) STREAMLIT
@@ -369,75 +144,259 @@ st.title("🚢 Simulasi Alokasi Container Yard")
 
 if 'simulation_results' not in st.session_state:
     st.session_state['simulation_results'] = None
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex
+    st.session_state['simulation_job'] = None
+if 'checkpoints' not in st.session_state:
+    # Checkpoint run terakhir sesi ini; edit jadwal berikutnya cukup disimulasikan ulang dari hari terdampak.
+    st.session_state['checkpoints'] = SimulationCheckpoints()
 
 with st.sidebar:
     st.header("1. Upload File")
-    uploaded_file = st.file_uploader("Upload Vessel Schedule (.xlsx)", type=['xlsx'])
+    uploaded_file = st.file_uploader("Upload Vessel Schedule (.xlsx, .csv, .parquet)", type=['xlsx', 'csv', 'parquet'])
     
+    df_schedule = None
     ignored_vessels = []
     if uploaded_file is not None:
         try:
-            temp_df = pd.read_excel(uploaded_file)
-            vessel_list = sorted(temp_df['VESSEL'].unique())
-            st.header("Filter Restriksi")
-            ignored_vessels = st.multiselect(
-                "Pilih kapal untuk diabaikan restriksinya:",
-                options=vessel_list
-            )
+            schedule_bytes = uploaded_file.getvalue()
+            df_schedule = load_schedule(schedule_digest(schedule_bytes), uploaded_file.name, schedule_bytes)
         except Exception as e:
-            st.warning(f"Tidak dapat membaca daftar kapal dari file: {e}")
+            st.error(f"Gagal membaca file jadwal: {e}")
+    layout_file = st.file_uploader("Upload Layout Yard (.json, .csv, .xlsx) - opsional", type=['json', 'csv', 'xlsx'],
+                                   help="Area, jumlah slot, dan kapasitas slot per terminal. Tanpa file: layout bawaan.")
+    layouts = {DEFAULT_TERMINAL: default_layout()}
+    if layout_file is not None:
+        try:
+            layout_bytes = layout_file.getvalue()
+            layouts = load_layouts(schedule_digest(layout_bytes), layout_file.name, layout_bytes)
+        except Exception as e:
+            st.error(f"Gagal membaca file layout: {e}")
+    terminal = st.selectbox(
+        "Terminal / layout yard:", list(layouts),
+        format_func=lambda name: f"{name} ({len(layouts[name].yard_config)} area, {layouts[name].total_slots} slot)"
+    )
+    yard_layout = layouts[terminal]
+    layout_kwargs = {'yard_config': yard_layout.yard_config, 'slot_capacity': yard_layout.slot_capacity}
+
+    if df_schedule is not None:
+        vessel_list = sorted(df_schedule['VESSEL'].unique())
+        st.header("Filter Restriksi")
+        ignored_vessels = st.multiselect(
+            "Pilih kapal untuk diabaikan restriksinya:",
+            options=vessel_list
+        )
 
     st.header("2. Pilih Level Aturan")
-    rule_level = st.selectbox("Pilih hierarki aturan:", ["Level 1: Optimal", "Level 2: Aman & Terfragmentasi", "Level 3: Darurat (Approval)"])
+    rule_level = st.selectbox("Pilih hierarki aturan:", RULE_LEVELS)
     st.header("3. Parameter Aturan")
-    intra_ship_gap, daily_exclusion_zone, inter_ship_gap = 5, 7, 10
-    if rule_level == "Level 3: Darurat (Approval)":
+    intra_ship_gap = daily_exclusion_zone = inter_ship_gap = None
+    if rule_level == EMERGENCY_RULE_LEVEL:
         st.warning("Mode Darurat: Aturan keamanan dilonggarkan.")
-        intra_ship_gap = st.slider("Jarak Internal Kapal", 1, 5, 2)
-        daily_exclusion_zone = st.slider("Zona Eksklusif Harian", 1, 7, 3)
-        inter_ship_gap = st.slider("Jarak Eksternal Kapal", 1, 10, 5)
-
-if uploaded_file:
+        intra_ship_gap = st.slider("Jarak Internal Kapal", 1, 5, EMERGENCY_RULE_VALUES['intra_ship_gap'])
+        daily_exclusion_zone = st.slider("Zona Eksklusif Harian", 1, 7, EMERGENCY_RULE_VALUES['daily_exclusion_zone'])
+        inter_ship_gap = st.slider("Jarak Eksternal Kapal", 1, 10, EMERGENCY_RULE_VALUES['inter_ship_gap'])
+    placement_score = st.selectbox("Pemilihan blok baru:", list(PLACEMENT_SCORE_LABELS), format_func=PLACEMENT_SCORE_LABELS.get,
+                                   help="Fungsi skor kandidat blok jika cluster kapal tidak bisa diperluas.")
+    sim_seed = st.number_input("Seed Simulasi", min_value=0, value=0, step=1,
+                               help="Seed pemilihan blok. Seed yang sama memberi hasil yang sama (dan diambil dari cache).")
+    enable_profiling = st.checkbox("Aktifkan profiling performa",
+                                   help="Merekam waktu per fase & per hari. Simulasi dijalankan ulang (tanpa cache).")
+
+if df_schedule is not None:
     try:
-        if 'df_schedule' not in st.session_state or st.session_state.get('uploaded_filename') != uploaded_file.name:
-            df_schedule = pd.read_excel(uploaded_file)
-            date_cols = ['OPEN STACKING', 'ETA', 'ETD']
-            for col in date_cols:
-                df_schedule[col] = pd.to_datetime(df_schedule[col], dayfirst=True, errors='coerce')
-            df_schedule['TOTAL BOX (TEUS)'] = pd.to_numeric(df_schedule['TOTAL BOX (TEUS)'], errors='coerce').fillna(0).astype(int)
-            df_schedule.dropna(subset=date_cols, inplace=True)
-            st.session_state['df_schedule'] = df_schedule
-            st.session_state['uploaded_filename'] = uploaded_file.name
-
-        df_schedule = st.session_state['df_schedule']
-        
         st.subheader("Data Vessel Schedule yang Di-upload (Sudah diproses)")
         st.dataframe(df_schedule)
 
-        df_trends = load_stacking_trends(STACKING_TREND_URL)
-
-        if df_trends is not None:
-            if st.button("🚀 Mulai Simulasi"):
-                sim_rules = {
-                    'intra_ship_gap': intra_ship_gap,
-                    'inter_ship_gap': inter_ship_gap,
-                    'daily_exclusion_zone': daily_exclusion_zone,
-                    'cluster_req_logic': 'Wajar' if rule_level != "Level 3: Darurat (Approval)" else 'Agresif',
-                    'ignored_vessels': ignored_vessels
-                }
-                with st.spinner("Menjalankan simulasi kompleks..."):
-                    st.session_state['simulation_results'] = run_simulation(df_schedule, df_trends, sim_rules, rule_level)
-                st.success(f"Simulasi Selesai! Dijalankan menggunakan **{rule_level}**.")
+        df_trends = load_stacking_trends(os.environ.get('STACKING_TREND_SOURCE') or None)
+        # Dengan file layout, simulasi utama hanya memakai kapal terminal terpilih (kolom TERMINAL).
+        df_sim_schedule = terminal_schedule(df_schedule, terminal) if layout_file is not None else df_schedule
+        if df_sim_schedule.empty:
+            st.warning(f"Tidak ada kapal untuk terminal {terminal} di jadwal.")
+
+        if df_trends is not None and not df_sim_schedule.empty:
+            sim_rules = build_rules(rule_level, intra_ship_gap, daily_exclusion_zone, inter_ship_gap, ignored_vessels,
+                                    placement_score)
+            job_running = st.session_state['simulation_job'] is not None
+            if st.button("🚀 Mulai Simulasi", disabled=job_running):
+                manager = get_job_manager()
+                checkpoints = st.session_state['checkpoints']
+                checkpoints.last_start_day = None
+                profiler = Profiler() if enable_profiling else None
+                try:
+                    if profiler is not None:
+                        job = manager.submit(
+                            st.session_state['session_id'], run_simulation, df_sim_schedule, df_trends, sim_rules, rule_level,
+                            int(sim_seed), profiler=profiler, checkpoints=checkpoints, label=rule_level, **layout_kwargs
+                        )
+                    else:
+                        job = manager.submit(
+                            st.session_state['session_id'], get_simulation_cache().get_or_run, df_sim_schedule, df_trends,
+                            sim_rules, rule_level, int(sim_seed), checkpoints=checkpoints, label=rule_level, **layout_kwargs
+                        )
+                except JobLimitError as e:
+                    st.warning(str(e))
+                else:
+                    st.session_state['simulation_job'] = {
+                        'id': job.id, 'rules': sim_rules, 'profiler': profiler,
+                        'warnings': unknown_service_warnings(df_sim_schedule, df_trends),
+                    }
+            if st.session_state['simulation_job'] is not None:
+                show_simulation_job()
+            for kind, message in st.session_state.pop('simulation_notices', []):
+                getattr(st, kind)(message)
+
+            with st.expander("🎲 Analisis Monte Carlo (Replikasi Ber-seed)"):
+                mc_col1, mc_col2 = st.columns(2)
+                with mc_col1:
+                    n_replications = st.number_input("Jumlah replikasi", min_value=2, max_value=1000, value=50, step=10)
+                with mc_col2:
+                    base_seed = st.number_input("Seed dasar", min_value=0, value=0, step=1)
+                if st.button("🎲 Jalankan Monte Carlo"):
+                    with st.spinner(f"Menjalankan {n_replications} replikasi secara paralel..."):
+                        st.session_state['monte_carlo_results'] = run_monte_carlo(
+                            df_sim_schedule, df_trends, sim_rules, rule_level,
+                            n_replications=int(n_replications), base_seed=int(base_seed), **layout_kwargs
+                        )
+
+                mc_result = st.session_state.get('monte_carlo_results')
+                if mc_result is not None:
+                    st.markdown("**Sebaran per Replikasi (Total Box Gagal & Puncak YOR)**")
+                    st.dataframe(mc_result.replication_summary())
+                    st.markdown("**Sebaran per Kapal**")
+                    st.dataframe(mc_result.vessel_summary())
+                    st.markdown("**Sebaran per Hari**")
+                    st.dataframe(mc_result.daily_summary())
+                    st.dataframe(mc_result.replications)
+
+                    replay_idx = st.selectbox(
+                        "Putar ulang replikasi:", options=list(mc_result.replications.index),
+                        format_func=lambda i: f"#{i} (seed {mc_result.seeds[i]})"
+                    )
+                    if st.button("🔁 Tampilkan Replikasi Ini"):
+                        store_simulation_results(run_with_warnings(mc_result.replay, replay_idx), sim_rules)
+
+            if st.session_state['simulation_results']:
+                with st.expander("🔎 Cek Kelayakan Kapal Tambahan (What-if)"):
+                    st.caption("Kapal tambahan dimasukkan ke jadwal dan disimulasikan ulang dari checkpoint terdekat "
+                               "(aturan, seed & layout di sidebar); hasil simulasi yang ditampilkan tidak diubah.")
+                    wi_col1, wi_col2, wi_col3 = st.columns(3)
+                    with wi_col1:
+                        wi_name = st.text_input("Nama kapal", value="KAPAL BARU")
+                        wi_service = st.selectbox("Service", options=list(df_trends.services))
+                        wi_teus = st.number_input("Total box (TEUS)", min_value=1, value=500, step=50)
+                    with wi_col2:
+                        wi_open = st.date_input("Open stacking", value=df_schedule['OPEN STACKING'].min())
+                        wi_eta = st.date_input("ETA", value=df_schedule['OPEN STACKING'].min() + pd.Timedelta(days=7))
+                        wi_etd = st.date_input("ETD", value=df_schedule['OPEN STACKING'].min() + pd.Timedelta(days=8))
+                    with wi_col3:
+                        wi_eta_hour = st.number_input("Jam ETA", min_value=0, max_value=23, value=12)
+                        wi_shift = st.slider("Coba geser jadwal (± hari)", 0, 7, 3)
+                    if st.button("🔎 Cek Kelayakan"):
+                        # Index di-cache per input simulasi; input sidebar berubah = checkpoint dasar baru.
+                        wi_key = simulation_key(df_sim_schedule, df_trends, sim_rules, int(sim_seed), **layout_kwargs)
+                        if st.session_state['feasibility'] is None or st.session_state['feasibility'][0] != wi_key:
+                            st.session_state['feasibility'] = (wi_key, FeasibilityIndex(
+                                df_sim_schedule, df_trends, sim_rules, rule_level, int(sim_seed),
+                                checkpoints=st.session_state['checkpoints'], **layout_kwargs
+                            ))
+                        feasibility = st.session_state['feasibility'][1]
+                        wi_args = (wi_name, int(wi_teus), pd.Timestamp(wi_open),
+                                   pd.Timestamp(wi_eta) + pd.Timedelta(hours=int(wi_eta_hour)), pd.Timestamp(wi_etd), wi_service)
+                        try:
+                            with st.spinner("Mensimulasikan ulang dari checkpoint terdekat..."):
+                                wi_result = run_with_warnings(feasibility.check, *wi_args)
+                        except ValueError as e:
+                            st.error(str(e))
+                        else:
+                            if wi_result.feasible:
+                                st.success(f"{wi_name} muat tanpa box tersisa di ETD.")
+                            else:
+                                st.warning(
+                                    f"{wi_name}: {wi_result.failed_boxes} box tetap tidak mendapat slot sampai ETD "
+                                    f"(gagal pada {len(wi_result.infeasible_days)} hari). "
+                                    f"Diblokir oleh: {', '.join(wi_result.blocking_vessels) or '-'}."
+                                )
+                            if wi_result.affected_vessels:
+                                st.info(f"Box gagal bertambah untuk: {', '.join(wi_result.affected_vessels)}.")
+                            st.dataframe(wi_result.daily)
+                            if wi_shift:
+                                st.markdown("**Alternatif Jadwal (seluruh jadwal digeser)**")
+                                st.dataframe(run_with_warnings(
+                                    feasibility.scan_open_dates, *wi_args, shifts=range(-wi_shift, wi_shift + 1)
+                                ))
+
+            if len(layouts) > 1:
+                with st.expander("🏗️ Simulasi Multi-Terminal (Paralel)"):
+                    if TERMINAL_COLUMN not in df_schedule.columns:
+                        st.info(f"Tambahkan kolom {TERMINAL_COLUMN} di jadwal untuk membagi kapal ke {len(layouts)} terminal.")
+                    elif st.button("🏗️ Jalankan Semua Terminal"):
+                        with st.spinner(f"Mensimulasikan {len(layouts)} terminal secara paralel..."):
+                            st.session_state['terminal_results'] = run_terminals(
+                                df_schedule, df_trends, sim_rules, rule_level, layouts, seed=int(sim_seed)
+                            )
+
+                    terminal_results = st.session_state.get('terminal_results')
+                    if terminal_results is not None:
+                        st.dataframe(terminal_results.terminal_summary())
+                        df_combined_yor = terminal_results.combined_yor()
+                        st.markdown("**YOR Harian Gabungan & per Terminal**")
+                        st.line_chart(df_combined_yor.set_index('Tanggal')[[c for c in df_combined_yor.columns if c.endswith('(%)')]])
+                        st.dataframe(df_combined_yor)
+                        st.markdown("**Rekapitulasi Gabungan**")
+                        st.dataframe(terminal_results.combined_recap())
+                        shown_terminal = st.selectbox("Detail terminal:", options=list(terminal_results.results))
+                        if st.button("🔁 Tampilkan Terminal Ini"):
+                            store_simulation_results(terminal_results.results[shown_terminal], sim_rules)
+
+            with st.expander("🧪 Sweep Parameter Aturan"):
+                sw_col1, sw_col2, sw_col3 = st.columns(3)
+                with sw_col1:
+                    intra_range = st.slider("Rentang Jarak Internal Kapal", 1, 5, (1, 5))
+                with sw_col2:
+                    exclusion_range = st.slider("Rentang Zona Eksklusif Harian", 1, 7, (1, 7))
+                with sw_col3:
+                    inter_range = st.slider("Rentang Jarak Eksternal Kapal", 1, 10, (1, 10))
+                sweep_logics = st.multiselect("Logika kebutuhan cluster:", options=CLUSTER_LOGIC_ORDER, default=CLUSTER_LOGIC_ORDER)
+                sweep_ignored_sets = [()]
+                if ignored_vessels and st.checkbox("Sertakan juga kapal yang diabaikan di sidebar"):
+                    sweep_ignored_sets.append(tuple(ignored_vessels))
+
+                sweep_rules = rule_grid(
+                    range(intra_range[0], intra_range[1] + 1),
+                    range(exclusion_range[0], exclusion_range[1] + 1),
+                    range(inter_range[0], inter_range[1] + 1),
+                    sweep_logics, sweep_ignored_sets, placement_score
+                )
+                st.caption(f"{len(sweep_rules)} kombinasi aturan akan disimulasikan.")
+                if st.button("🧪 Jalankan Sweep") and sweep_rules:
+                    with st.spinner(f"Menjalankan {len(sweep_rules)} kombinasi secara paralel..."):
+                        st.session_state['sweep_results'] = run_rule_sweep(df_sim_schedule, df_trends, sweep_rules, **layout_kwargs)
+
+                df_sweep = st.session_state.get('sweep_results')
+                if df_sweep is not None:
+                    best = least_relaxed(df_sweep)
+                    if best is None:
+                        st.warning("Tidak ada kombinasi aturan yang muat tanpa box gagal.")
+                    else:
+                        st.success(
+                            f"Kombinasi paling ketat yang muat: Jarak Internal {best['Jarak Internal Kapal']}, "
+                            f"Zona Eksklusif {best['Zona Eksklusif Harian']}, Jarak Eksternal {best['Jarak Eksternal Kapal']}, "
+                            f"Logika {best['Logika Cluster']}."
+                        )
+                    st.dataframe(df_sweep)
     
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memproses file Anda: {e}")
 
 if st.session_state['simulation_results']:
+    render_start = time.perf_counter()
     df_yor, df_recap, df_map, df_daily_log, daily_snapshots, vessels_data = st.session_state['simulation_results']
+    yard_view = st.session_state['yard_view']
     
     st.header("📍 Visualisasi Yard Harian (Interaktif)")
     
-    date_options = list(daily_snapshots.keys())
+    date_options = yard_view.dates
     if date_options:
         selected_date = st.select_slider(
             'Geser untuk memilih tanggal:',
@@ -450,66 +409,39 @@ if st.session_state['simulation_results']:
         with tab1:
             st.subheader(f"Ringkasan Kondisi Area untuk {selected_date.strftime('%d %b %Y')}")
             
-            yard_state_on_date = daily_snapshots[selected_date]
-            
-            operationally_active_vessels = {
-                v['name'] for v_name, v in vessels_data.items()
-                if selected_date.normalize() >= (v['eta_date'] - timedelta(hours=8)).normalize() and selected_date.normalize() <= v['etd_date'].normalize()
-            }
-
             cols = st.columns(4)
-            col_idx = 0
-            for area_name, area_size in DEFAULT_YARD_CONFIG.items():
-                with cols[col_idx]:
-                    slots_in_area = [(area_name, i) for i in range(1, area_size + 1)]
-                    occupied_slots = [s for s in slots_in_area if yard_state_on_date.get(s) is not None]
-                    
-                    vessels_in_area_details = {}
-                    for slot in occupied_slots:
-                        vessel = yard_state_on_date.get(slot)
-                        if vessel not in vessels_in_area_details:
-                            vessels_in_area_details[vessel] = []
-                        vessels_in_area_details[vessel].append(slot)
-                    
-                    restricting_vessels = {v for v in vessels_in_area_details.keys() if v in operationally_active_vessels and v not in ignored_vessels}
-
+            for col_idx, summary in enumerate(yard_view.area_summaries(selected_date)):
+                area_size = summary['size']
+                restricting_vessels = yard_view.restricting_vessels(summary, ignored_vessels)
+                with cols[col_idx % 4]:
                     with st.container():
-                        st.markdown(f"**{area_name}**")
-                        st.metric(label="Slot Terpakai", value=f"{len(occupied_slots)} / {area_size}", delta=f"{(len(occupied_slots)/area_size)*100:.1f}%")
+                        st.markdown(f"**{summary['area']}**")
+                        st.metric(label="Slot Terpakai", value=f"{summary['occupied']} / {area_size}", delta=f"{(summary['occupied']/area_size)*100:.1f}%")
                         
                         st.markdown("**Detail Kapal & Slot:**")
-                        if not vessels_in_area_details:
+                        if not summary['vessels']:
                             st.text("- Kosong -")
                         else:
-                            for vessel, slots in sorted(vessels_in_area_details.items()):
-                                slots.sort(key=lambda s: s[1])
-                                groups = []
-                                for k, g in itertools.groupby(enumerate(slots), lambda item: item[1][1] - item[0]):
-                                    group = list(item[1] for item in g)
-                                    start, end = group[0][1], group[-1][1]
-                                    groups.append(f"{start}" if start == end else f"{start}-{end}")
-                                st.text(f"• {vessel}: Slot {', '.join(groups)}")
+                            for vessel, slot_ranges in summary['vessels']:
+                                st.text(f"• {vessel}: Slot {slot_ranges}")
                         
                         st.markdown("**Status:**")
                         if restricting_vessels:
-                            st.warning(f"⚠️ Terkena Restriksi oleh: {', '.join(sorted(list(restricting_vessels)))}")
+                            st.warning(f"⚠️ Terkena Restriksi oleh: {', '.join(restricting_vessels)}")
                         else:
                             st.success("✅ Area Bebas")
                         st.markdown("---")
-                col_idx = (col_idx + 1) % 4
 
         with tab2:
             st.subheader(f"Rencana Alokasi untuk {selected_date.strftime('%d %b %Y')}")
             
-            log_for_selected_date = df_daily_log[df_daily_log['Tanggal'] == selected_date.strftime('%Y-%m-%d')]
+            plan_for_selected_date = yard_view.daily_plan(selected_date)
             
-            if log_for_selected_date.empty:
+            if plan_for_selected_date.empty:
                 st.info("Tidak ada aktivitas alokasi yang dijadwalkan pada tanggal ini.")
             else:
-                active_vessels_on_date = log_for_selected_date['Kapal'].unique()
-                
-                for vessel_name in active_vessels_on_date:
-                    vessel_log = log_for_selected_date[log_for_selected_date['Kapal'] == vessel_name].iloc[0]
+                for vessel_log in plan_for_selected_date.to_dict('records'):
+                    vessel_name = vessel_log['Kapal']
                     boxes_needed = vessel_log['Butuh Box']
                     slots_needed = vessel_log['Butuh Slot']
                     
@@ -540,5 +472,40 @@ if st.session_state['simulation_results']:
     st.header("📓 Log Alokasi Harian")
     st.dataframe(df_daily_log[['Tanggal', 'Kapal', 'Butuh Box', 'Butuh Slot', 'Slot Berhasil', 'Slot Gagal', 'Box Gagal Harian', 'Rekomendasi']])
 
+    st.header("💾 Export Hasil")
+    include_occupancy = st.checkbox("Sertakan matriks okupansi slot harian (tanggal x slot)", value=True)
+    results = st.session_state['simulation_results']
+    # File dibangun saat tombol diklik (di thread terpisah), per chunk ke file sementara.
+    export_formats = [('xlsx', "Unduh Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")]
+    if importlib.util.find_spec('pyarrow') is not None:
+        export_formats.append(('parquet', "Unduh Parquet (.zip)", "application/zip"))
+    export_formats.append(('csv', "Unduh CSV (.zip)", "application/zip"))
+    for export_col, (fmt, label, mime) in zip(st.columns(len(export_formats)), export_formats):
+        with export_col:
+            st.download_button(
+                label, data=lambda fmt=fmt: export_bytes(results, fmt, include_occupancy),
+                file_name=f"yard_sim_hasil.{'xlsx' if fmt == 'xlsx' else 'zip'}", mime=mime, on_click='ignore',
+            )
+
+    profile = st.session_state.get('profile')
+    if profile is not None:
+        # Waktu render adalah render halaman hasil pada rerun ini (tanpa panel performa).
+        profile.set_time('render', time.perf_counter() - render_start)
+        with st.expander("⏱️ Performance"):
+            st.markdown("**Waktu per Fase** (fase bersarang: `block_selection` dll. termasuk dalam `allocate`)")
+            st.dataframe(profile.phase_frame())
+            st.markdown("**Waktu per Hari Simulasi (s)**")
+            df_profile_daily = profile.daily_frame(df_yor['Tanggal'])
+            if not df_profile_daily.empty:
+                st.line_chart(df_profile_daily['day'])
+                st.dataframe(df_profile_daily)
+            st.markdown("**Counter & Observasi**")
+            st.dataframe(profile.counter_frame())
+            perf_col1, perf_col2 = st.columns(2)
+            with perf_col1:
+                st.download_button("Unduh JSON", profile.to_json(), file_name="yard_sim_profile.json", mime="application/json")
+            with perf_col2:
+                st.download_button("Unduh CSV", profile.to_csv(), file_name="yard_sim_profile.csv", mime="text/csv")
+
 elif not uploaded_file:
-    st.info("Silakan upload file 'Vessel Schedule' dalam format .xlsx untuk memulai simulasi.")
+    st.info("Silakan upload file 'Vessel Schedule' (.xlsx, .csv, atau .parquet) untuk memulai simulasi.")
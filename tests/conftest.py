@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import pytest
+
+from yard_sim.schedule import read_schedule
+from yard_sim.trends import DEFAULT_TRENDS_PATH, read_stacking_trends
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+
+@pytest.fixture(scope='session')
+def schedule():
+    """Jadwal kecil (40 kapal, 30 hari) dengan box gagal di Level 1 maupun Level 3."""
+    return read_schedule(DATA_DIR / 'schedule.csv')
+
+
+@pytest.fixture(scope='session')
+def trends():
+    return read_stacking_trends(DEFAULT_TRENDS_PATH)
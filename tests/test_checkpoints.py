@@ -0,0 +1,83 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from yard_sim.checkpoints import SimulationCheckpoints
+from yard_sim.simulation import RULE_LEVELS, build_rules, run_simulation
+from yard_sim.trends import TrendMatrix
+
+SEED = 3
+
+
+def _run(schedule, trends, rule_level, ignored_vessels=(), seed=SEED, checkpoints=None):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return run_simulation(schedule, trends, build_rules(rule_level, ignored_vessels=ignored_vessels), rule_level,
+                              seed=seed, checkpoints=checkpoints)
+
+
+def assert_same_results(resumed, full):
+    for resumed_table, full_table in zip(resumed[:4], full[:4]):
+        pd.testing.assert_frame_equal(resumed_table.reset_index(drop=True), full_table.reset_index(drop=True),
+                                      check_categorical=False)
+    assert list(resumed[4]) == list(full[4])
+    for current_date in full[4]:
+        assert np.array_equal(resumed[4].owner_on(current_date), full[4].owner_on(current_date)), current_date
+    for name, ship in full[5].items():
+        assert resumed[5][name]['clusters'] == ship['clusters'], name
+        assert resumed[5][name]['remaining_capacity'] == ship['remaining_capacity'], name
+
+
+def _late_row(schedule):
+    """Baris kapal yang mulai di tengah jadwal (setelah beberapa checkpoint)."""
+    return schedule['OPEN STACKING'].sort_values().index[len(schedule) // 2]
+
+
+def _edit(schedule, kind):
+    """Jadwal dengan satu perubahan yang bisa dilanjutkan dari checkpoint."""
+    schedule = schedule.copy()
+    late = _late_row(schedule)
+    if kind == 'etd':
+        schedule.loc[late, 'ETD'] += pd.Timedelta(days=1)
+    elif kind == 'eta':
+        schedule.loc[late, 'ETA'] -= pd.Timedelta(hours=20)
+    elif kind == 'teus':
+        schedule.loc[late, 'TOTAL BOX (TEUS)'] = 2400
+    elif kind == 'new_vessel':
+        row = schedule.loc[[late]].assign(VESSEL='KAPAL BARU')
+        schedule = pd.concat([schedule, row], ignore_index=True)
+    return schedule
+
+
+@pytest.mark.parametrize('rule_level', [RULE_LEVELS[0], RULE_LEVELS[2]])
+@pytest.mark.parametrize('kind', ['etd', 'eta', 'teus', 'new_vessel', 'ignored', 'unchanged'])
+def test_resume_matches_full_run(schedule, trends, rule_level, kind):
+    trends = TrendMatrix.from_frame(trends)
+    checkpoints = SimulationCheckpoints(interval=3)
+    _run(schedule, trends, rule_level, checkpoints=checkpoints)
+
+    edited = _edit(schedule, kind)
+    ignored = [schedule.loc[_late_row(schedule), 'VESSEL']] if kind == 'ignored' else []
+    resumed = _run(edited, trends, rule_level, ignored, checkpoints=checkpoints)
+    assert checkpoints.last_start_day > 0
+    assert_same_results(resumed, _run(edited, trends, rule_level, ignored))
+
+
+def test_consecutive_resumes_match_full_runs(schedule, trends):
+    trends = TrendMatrix.from_frame(trends)
+    rule_level = RULE_LEVELS[0]
+    checkpoints = SimulationCheckpoints(interval=3)
+    _run(schedule, trends, rule_level, checkpoints=checkpoints)
+    for kind in ['teus', 'etd', 'new_vessel', 'eta']:
+        schedule = _edit(schedule, kind)
+        resumed = _run(schedule, trends, rule_level, checkpoints=checkpoints)
+        assert_same_results(resumed, _run(schedule, trends, rule_level))
+
+
+def test_incompatible_change_runs_full_simulation(schedule, trends):
+    checkpoints = SimulationCheckpoints(interval=3)
+    _run(schedule, trends, RULE_LEVELS[0], checkpoints=checkpoints)
+    _run(schedule, trends, RULE_LEVELS[0], seed=SEED + 1, checkpoints=checkpoints)
+    assert checkpoints.last_start_day == 0
@@ -0,0 +1,37 @@
+"""Output ``run_simulation`` dibandingkan dengan hasil implementasi awal (app.py sebelum ``yard_sim``).
+
+File ``data/golden_*.csv`` dibuat dari ``run_simulation`` versi awal dengan
+``random.seed(SEED)`` pada ``data/schedule.csv``; engine baru dengan
+``seed=SEED`` harus menghasilkan tabel yang sama persis.
+"""
+
+import warnings
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from yard_sim.simulation import RULE_LEVELS, build_rules, run_simulation
+
+DATA_DIR = Path(__file__).parent / 'data'
+SEED = 7
+IGNORED_VESSELS = {RULE_LEVELS[0]: [], RULE_LEVELS[2]: ['V003', 'V011']}
+
+
+def _golden(name, rule_level):
+    df = pd.read_csv(DATA_DIR / f'golden_{name}.csv')
+    return df[df['Level'] == rule_level].drop(columns='Level').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('rule_level', list(IGNORED_VESSELS))
+def test_matches_golden_output(schedule, trends, rule_level):
+    rules = build_rules(rule_level, ignored_vessels=IGNORED_VESSELS[rule_level])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df_yor, df_recap, _, df_daily_log, _, _ = run_simulation(schedule, trends, rules, rule_level, seed=SEED)
+
+    df_yor = df_yor.assign(Tanggal=df_yor['Tanggal'].dt.strftime('%Y-%m-%d'))
+    pd.testing.assert_frame_equal(df_yor, _golden('yor', rule_level), check_dtype=False)
+    pd.testing.assert_frame_equal(df_recap.reset_index(drop=True), _golden('recap', rule_level), check_dtype=False)
+    df_daily_log = df_daily_log.astype({'Tanggal': str, 'Kapal': str, 'Rekomendasi': str})
+    pd.testing.assert_frame_equal(df_daily_log.reset_index(drop=True), _golden('log', rule_level), check_dtype=False)
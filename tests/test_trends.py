@@ -0,0 +1,50 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from yard_sim import trends as trends_module
+from yard_sim.trends import load_trend_matrix
+
+
+def _write_trends(path, services):
+    pd.DataFrame({
+        'STACKING TREND': services,
+        'DAY 0': [0.2] * len(services),
+        'DAY 1': [0.8] * len(services),
+    }).to_excel(path, index=False)
+
+
+def test_trend_cache_keeps_service_key_types(tmp_path, monkeypatch):
+    path = tmp_path / 'trends.xlsx'
+    _write_trends(path, [101, 202, 'JKT'])
+
+    first = load_trend_matrix(path, cache_dir=tmp_path)
+
+    def no_parse(source):
+        raise AssertionError('cache tidak dipakai')
+
+    monkeypatch.setattr(trends_module, 'read_stacking_trends', no_parse)
+    second = load_trend_matrix(path, cache_dir=tmp_path)
+
+    assert first.services == second.services == [101, 202, 'JKT']
+    assert [type(s) for s in second.services] == [int, int, str]
+    assert 101 in second and 'JKT' in second
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        second.daily_arrivals([100], [101], [2])
+
+
+def test_trend_cache_without_type_tags_is_reparsed(tmp_path):
+    path = tmp_path / 'trends.xlsx'
+    _write_trends(path, [101, 202])
+    stat = path.stat()
+    # Format cache lama: kunci SERVICE hanya sebagai teks.
+    np.savez(
+        tmp_path / '.trends.xlsx.trends.npz',
+        services=np.array(['101', '202']), matrix=np.array([[0.2, 0.8], [0.2, 0.8]]),
+        meta=np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64), sha256=np.array(''),
+    )
+
+    assert load_trend_matrix(path, cache_dir=tmp_path).services == [101, 202]
+    assert load_trend_matrix(path, cache_dir=tmp_path).services == [101, 202]
@@ -0,0 +1,79 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from yard_sim.benchmark import synthetic_schedule, synthetic_trends, synthetic_yard_config
+from yard_sim.checkpoints import SimulationCheckpoints
+from yard_sim.schedule import normalize_schedule
+from yard_sim.simulation import RULE_LEVELS, build_rules, run_simulation
+from yard_sim.whatif import FeasibilityIndex
+
+RULE_LEVEL = RULE_LEVELS[0]
+SEED = 0
+
+
+@pytest.fixture(scope='module')
+def dense_yard():
+    """Yard padat (puncak YOR > 90%) beserta store checkpoint run dasarnya."""
+    df_schedule = normalize_schedule(synthetic_schedule(150, horizon_days=30))
+    trends = synthetic_trends()
+    rules = build_rules(RULE_LEVEL)
+    yard_config = synthetic_yard_config(20)
+    checkpoints = SimulationCheckpoints()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df_yor = run_simulation(df_schedule, trends, rules, RULE_LEVEL, seed=SEED, yard_config=yard_config,
+                                checkpoints=checkpoints)[0]
+    assert df_yor['Rasio Okupansi (%)'].max() > 90
+    index = FeasibilityIndex(df_schedule, trends, rules, RULE_LEVEL, SEED, yard_config=yard_config,
+                             checkpoints=checkpoints)
+    return df_schedule, trends, rules, yard_config, index
+
+
+@pytest.mark.parametrize('start_day', [3, 10, 20])
+def test_check_matches_rerun_with_candidate(dense_yard, start_day):
+    df_schedule, trends, rules, yard_config, index = dense_yard
+    open_stacking = df_schedule['OPEN STACKING'].min() + pd.Timedelta(days=start_day)
+    eta = open_stacking + pd.Timedelta(days=6, hours=10)
+    etd = open_stacking + pd.Timedelta(days=7)
+    candidate = dict(name='KANDIDAT', total_boxes=1800, open_stacking=open_stacking, eta=eta, etd=etd,
+                     service=trends.index[0])
+    result = index.check(**candidate)
+
+    df_rerun = pd.concat([df_schedule, pd.DataFrame({
+        'VESSEL': ['KANDIDAT'], 'SERVICE': [candidate['service']], 'TOTAL BOX (TEUS)': [1800],
+        'OPEN STACKING': [open_stacking], 'ETA': [eta], 'ETD': [etd],
+    })], ignore_index=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        _, df_recap, _, df_daily_log, _, vessels = run_simulation(
+            df_rerun, trends, rules, RULE_LEVEL, seed=SEED, yard_config=yard_config
+        )
+        base_recap = run_simulation(df_schedule, trends, rules, RULE_LEVEL, seed=SEED, yard_config=yard_config)[1]
+
+    expected = df_daily_log[df_daily_log['Kapal'] == 'KANDIDAT'].reset_index(drop=True)
+    for column in ['Butuh Box', 'Butuh Slot', 'Slot Berhasil', 'Box Gagal Harian', 'Rekomendasi']:
+        assert result.daily[column].tolist() == expected[column].tolist()
+    assert result.failed_boxes == max(0, -vessels['KANDIDAT']['remaining_capacity'])
+    assert 0 <= result.failed_boxes <= 1800
+
+    failed_before = base_recap.set_index('Kapal')['Box Gagal']
+    failed_after = df_recap.set_index('Kapal')['Box Gagal']
+    assert result.affected_vessels == sorted(
+        name for name in failed_before.index if failed_after[name] > failed_before[name]
+    )
+    # Hari gagal karena zona blokir menyebut kapal pemblokirnya.
+    blocked_days = result.daily[(result.daily['Slot Gagal'] > 0) & (result.daily['Slot Kosong'] > 0)]
+    assert all(blocked_days['Diblokir Oleh'].map(len) > 0)
+
+
+def test_check_leaves_base_checkpoints_untouched(dense_yard):
+    df_schedule, trends, _, _, index = dense_yard
+    open_stacking = df_schedule['OPEN STACKING'].min() + pd.Timedelta(days=5)
+    dates = (open_stacking, open_stacking + pd.Timedelta(days=4), open_stacking + pd.Timedelta(days=5))
+    first = index.check('KANDIDAT', 900, *dates, service=trends.index[0])
+    second = index.check('KANDIDAT', 900, *dates, service=trends.index[0])
+    pd.testing.assert_frame_equal(first.daily, second.daily)
+    with pytest.raises(ValueError):
+        index.check(df_schedule['VESSEL'].iloc[0], 900, *dates, service=trends.index[0])
@@ -0,0 +1,68 @@
+"""Inti simulasi alokasi container yard (tanpa antarmuka Streamlit).
+
+Semua nama publik dimuat secara lazy, sehingga ``import yard_sim`` tidak
+langsung memuat NumPy/pandas atau modul pool proses sampai dibutuhkan.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'YardState': '.engine',
+    'BlockingIndex': '.blocking',
+    'YardSnapshots': '.snapshots',
+    'DEFAULT_YARD_CONFIG': '.simulation',
+    'DEFAULT_SLOT_CAPACITY': '.simulation',
+    'RULE_LEVELS': '.simulation',
+    'build_rules': '.simulation',
+    'get_daily_arrivals': '.simulation',
+    'run_simulation': '.simulation',
+    'find_placeable_slots': '.simulation',
+    'allocate_slots_intelligently': '.simulation',
+    'PlacementCandidates': '.placement',
+    'placement_candidates': '.placement',
+    'select_placement': '.placement',
+    'PLACEMENT_SCORES': '.placement',
+    'read_schedule': '.schedule',
+    'normalize_schedule': '.schedule',
+    'read_schedule_bytes': '.schedule',
+    'schedule_digest': '.schedule',
+    'read_stacking_trends': '.trends',
+    'STACKING_TREND_URL': '.trends',
+    'TrendMatrix': '.trends',
+    'load_trend_matrix': '.trends',
+    'result_tables': '.export',
+    'export_tables': '.export',
+    'export_file': '.export',
+    'YardLayout': '.layouts',
+    'default_layout': '.layouts',
+    'read_layouts': '.layouts',
+    'read_layouts_bytes': '.layouts',
+    'split_schedule': '.terminals',
+    'run_terminals': '.terminals',
+    'SimulationCache': '.cache',
+    'simulation_key': '.cache',
+    'Profiler': '.profiling',
+    'SimulationCheckpoints': '.checkpoints',
+    'FeasibilityIndex': '.whatif',
+    'JobManager': '.jobs',
+    'JobCancelled': '.jobs',
+    'JobLimitError': '.jobs',
+    'FeasibilityResult': '.whatif',
+    'run_monte_carlo': '.montecarlo',
+    'run_rule_sweep': '.sweep',
+    'rule_grid': '.sweep',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,133 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+DAILY_LOG_COLUMNS = ['Tanggal', 'Kapal', 'Butuh Box', 'Butuh Slot', 'Slot Berhasil', 'Slot Gagal', 'Box Gagal Harian', 'Rekomendasi']
+
+
+class DailyLogBuffer:
+    """Buffer kolom bertipe untuk log alokasi harian.
+
+    Tanggal dan kapal disimpan sebagai kode integer (indeks hari dan id kapal)
+    lalu dijadikan kolom kategorikal saat :meth:`to_frame`, sehingga string
+    yang sama tidak disimpan berulang kali.
+    """
+
+    def __init__(self):
+        self.day = array('q')
+        self.vessel_id = array('q')
+        self.boxes_needed = array('q')
+        self.slots_needed = array('q')
+        self.slots_allocated = array('q')
+        self.boxes_failed = array('q')
+        self.recommendation = []
+
+    def append(self, day, vessel_id, boxes_needed, slots_needed, slots_allocated, boxes_failed, recommendation):
+        self.day.append(day)
+        self.vessel_id.append(vessel_id)
+        self.boxes_needed.append(int(boxes_needed))
+        self.slots_needed.append(slots_needed)
+        self.slots_allocated.append(slots_allocated)
+        self.boxes_failed.append(boxes_failed)
+        self.recommendation.append(recommendation)
+
+    def __len__(self):
+        return len(self.day)
+
+    def head(self, n):
+        """Salinan buffer berisi ``n`` baris pertama."""
+        buffer = DailyLogBuffer()
+        for name in ('day', 'vessel_id', 'boxes_needed', 'slots_needed', 'slots_allocated', 'boxes_failed'):
+            setattr(buffer, name, getattr(self, name)[:n])
+        buffer.recommendation = self.recommendation[:n]
+        return buffer
+
+    def failed_boxes_by_vessel(self, num_vessel_ids):
+        """Total box gagal per id kapal (satu reduksi ``bincount``)."""
+        return np.bincount(
+            np.frombuffer(self.vessel_id, dtype=np.int64),
+            weights=np.frombuffer(self.boxes_failed, dtype=np.int64),
+            minlength=num_vessel_ids,
+        ).astype(np.int64)
+
+    def to_frame(self, date_range, vessel_names):
+        """DataFrame log harian; ``vessel_names[i]`` adalah nama kapal dengan id ``i``."""
+        slots_needed = np.frombuffer(self.slots_needed, dtype=np.int64)
+        slots_allocated = np.frombuffer(self.slots_allocated, dtype=np.int64)
+        date_labels = pd.Index(date_range.strftime('%Y-%m-%d'))
+        return pd.DataFrame({
+            'Tanggal': pd.Categorical.from_codes(np.frombuffer(self.day, dtype=np.int64), categories=date_labels),
+            'Kapal': pd.Categorical.from_codes(
+                np.frombuffer(self.vessel_id, dtype=np.int64) - 1, categories=pd.Index(vessel_names[1:])
+            ),
+            'Butuh Box': np.frombuffer(self.boxes_needed, dtype=np.int64).copy(),
+            'Butuh Slot': slots_needed.copy(),
+            'Slot Berhasil': slots_allocated.copy(),
+            'Slot Gagal': slots_needed - slots_allocated,
+            'Box Gagal Harian': np.frombuffer(self.boxes_failed, dtype=np.int64).copy(),
+            'Rekomendasi': pd.array(self.recommendation, dtype=object),
+        }, columns=DAILY_LOG_COLUMNS)
+
+
+def build_recap(vessels, failed_by_vessel_id):
+    """Rekap per kapal dari hasil reduksi box gagal per id kapal."""
+    ships = list(vessels.values())
+    requested = np.array([ship['total_boxes'] for ship in ships], dtype=np.int64)
+    failed = failed_by_vessel_id[np.array([ship['vessel_id'] for ship in ships], dtype=np.int64)]
+    return pd.DataFrame({
+        'Kapal': [ship['name'] for ship in ships],
+        'Permintaan Box': requested,
+        'Box Berhasil': requested - failed,
+        'Box Gagal': failed,
+    }, columns=['Kapal', 'Permintaan Box', 'Box Berhasil', 'Box Gagal'])
+
+
+def format_slot_runs(yard, indices, group_ids):
+    """Teks rentang slot ``AREA:awal-akhir`` per grup dari indeks global terurut per grup.
+
+    Run dideteksi secara vektor: run putus jika indeks global tidak berurutan
+    atau grup berganti. Mengembalikan ``{group_id: "A01:1-5, A02:3"}``.
+    """
+    if len(indices) == 0:
+        return {}
+    breaks = np.flatnonzero((np.diff(indices) != 1) | (np.diff(group_ids) != 0)) + 1
+    first = np.concatenate(([0], breaks))
+    last = np.concatenate((breaks - 1, [len(indices) - 1]))
+    start_idx, end_idx = indices[first], indices[last]
+    areas = np.asarray(yard.areas, dtype=object)[yard.slot_area[start_idx]]
+    start_num = yard.slot_number[start_idx]
+    end_num = yard.slot_number[end_idx]
+
+    texts = {}
+    for group, area, s, e, single in zip(group_ids[first].tolist(), areas, start_num.tolist(), end_num.tolist(),
+                                         (start_idx == end_idx).tolist()):
+        text = f"{area}:{s}" if single else f"{area}:{s}-{e}"
+        texts.setdefault(group, []).append(text)
+    return {group: ", ".join(parts) for group, parts in texts.items()}
+
+
+def build_allocation_map(vessels, yard):
+    """Peta alokasi akhir: satu baris per cluster tidak kosong dengan rentang slotnya."""
+    rows, indices, group_ids = [], [], []
+    for ship in vessels.values():
+        for i, cluster in enumerate(ship['clusters']):
+            if not cluster:
+                continue
+            group = len(rows)
+            rows.append((ship['name'], f'Cluster {i+1}'))
+            cluster_indices = np.fromiter((yard.slot_index(slot) for slot in cluster), dtype=np.int64, count=len(cluster))
+            order = np.argsort(cluster_indices, kind='stable')
+            # Cluster diurutkan in place seperti sebelumnya; state kapal ikut dikembalikan ke pemanggil.
+            cluster[:] = [cluster[j] for j in order]
+            indices.append(cluster_indices[order])
+            group_ids.append(np.full(len(cluster), group, dtype=np.int64))
+
+    if not rows:
+        return pd.DataFrame(columns=['Kapal', 'Cluster', 'Lokasi & Slot'])
+    texts = format_slot_runs(yard, np.concatenate(indices), np.concatenate(group_ids))
+    return pd.DataFrame({
+        'Kapal': [name for name, _ in rows],
+        'Cluster': [label for _, label in rows],
+        'Lokasi & Slot': [texts[group] for group in range(len(rows))],
+    })
@@ -0,0 +1,299 @@
+"""Benchmark engine alokasi dengan beban sintetis ber-seed.
+
+Jalankan ``python -m yard_sim.benchmark`` untuk tangga skala default, atau
+``--save-baseline``/``--baseline`` untuk menyimpan dan membandingkan hasil.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from . import simulation
+from .schedule import normalize_schedule
+from .simulation import DEFAULT_SLOT_CAPACITY, RULE_LEVELS, build_rules, find_placeable_slots, run_simulation
+from .trends import TrendMatrix
+
+BASELINE_VERSION = 1
+# Tangga skala default: (jumlah kapal, jumlah area); horizon & slot per area tetap.
+DEFAULT_LADDER = [(50, 12), (100, 24), (200, 48), (400, 96)]
+PHASES = ['generate', 'normalize', 'trends', 'simulate', 'allocate', 'find_placeable_slots']
+
+
+# --- Generator Beban Sintetis ---
+
+def synthetic_yard_config(n_areas, slots_per_area=40):
+    """Layout yard sintetis ``{'Y001': slots_per_area, ...}``."""
+    return {f'Y{i + 1:03d}': int(slots_per_area) for i in range(n_areas)}
+
+
+def synthetic_trends(n_services=8, max_days=10, seed=0):
+    """Tabel stacking trend sintetis (index SERVICE, kolom ``DAY i``, tiap baris berjumlah 1)."""
+    rng = np.random.default_rng(seed)
+    matrix = np.zeros((n_services, max_days))
+    for s in range(n_services):
+        length = int(rng.integers(max(1, max_days // 2), max_days + 1))
+        matrix[s, :length] = rng.dirichlet(np.ones(length))
+    services = pd.Index([f'SVC-{s + 1:02d}' for s in range(n_services)], name='SERVICE')
+    return pd.DataFrame(matrix, index=services, columns=[f'DAY {i}' for i in range(max_days)])
+
+
+def synthetic_schedule(n_vessels, horizon_days=60, services=None, teus_distribution='lognormal',
+                       teus_mean=1200, teus_range=(200, 2500), stay_days=(4, 8), seed=0,
+                       start=pd.Timestamp('2025-01-01')):
+    """Vessel Schedule sintetis dengan kolom yang sama seperti file upload.
+
+    ``teus_distribution`` ``'lognormal'`` (rata-rata ``teus_mean``, dipotong ke
+    ``teus_range``) atau ``'uniform'`` (seragam di ``teus_range``).
+    """
+    rng = np.random.default_rng(seed)
+    services = list(services) if services is not None else list(synthetic_trends(seed=seed).index)
+    lo, hi = teus_range
+    if teus_distribution == 'uniform':
+        teus = rng.integers(lo, hi + 1, size=n_vessels)
+    elif teus_distribution == 'lognormal':
+        sigma = 0.5
+        teus = rng.lognormal(np.log(teus_mean) - sigma ** 2 / 2, sigma, size=n_vessels)
+        teus = np.clip(np.round(teus), lo, hi).astype(np.int64)
+    else:
+        raise ValueError(f"Distribusi TEUS tidak dikenal: {teus_distribution}")
+
+    open_stacking = (start + pd.to_timedelta(rng.integers(0, horizon_days, size=n_vessels), unit='D')
+                     + pd.to_timedelta(rng.integers(0, 24, size=n_vessels), unit='h'))
+    stay = pd.to_timedelta(rng.integers(stay_days[0], stay_days[1], size=n_vessels), unit='D')
+    eta = open_stacking.normalize() + stay + pd.to_timedelta(rng.integers(0, 24, size=n_vessels), unit='h')
+    etd = eta + pd.to_timedelta(rng.integers(12, 40, size=n_vessels), unit='h')
+    return pd.DataFrame({
+        'VESSEL': [f'V{i:05d}' for i in range(n_vessels)],
+        'SERVICE': [services[i] for i in rng.integers(0, len(services), size=n_vessels)],
+        'OPEN STACKING': open_stacking, 'ETA': eta, 'ETD': etd,
+        'TOTAL BOX (TEUS)': teus,
+    })
+
+
+# --- Pengukuran ---
+
+@contextmanager
+def _instrumented_allocation(stats, probe_placeable=True):
+    """Membungkus ``allocate_slots_intelligently`` selama simulasi untuk mengukur waktunya.
+
+    Jika ``probe_placeable``, ``find_placeable_slots`` ikut diukur pada state
+    yard yang sama sebelum setiap alokasi (waktunya dicatat terpisah).
+    """
+    original = simulation.allocate_slots_intelligently
+
+    def timed(ship, slots_needed, yard, blocking, rules, rng, **kwargs):
+        if probe_placeable:
+            t0 = time.perf_counter()
+            find_placeable_slots(ship, yard, blocking)
+            stats['find_placeable_slots'] += time.perf_counter() - t0
+            stats['find_placeable_slots_calls'] += 1
+        t0 = time.perf_counter()
+        result = original(ship, slots_needed, yard, blocking, rules, rng, **kwargs)
+        stats['allocate'] += time.perf_counter() - t0
+        stats['allocate_calls'] += 1
+        return result
+
+    simulation.allocate_slots_intelligently = timed
+    try:
+        yield
+    finally:
+        simulation.allocate_slots_intelligently = original
+
+
+def run_case(n_vessels, n_areas, horizon_days=60, slots_per_area=40, rule_level=RULE_LEVELS[0],
+             teus_distribution='lognormal', n_services=8, seed=0, measure_memory=True):
+    """Menjalankan satu kasus benchmark; mengembalikan dict waktu per fase, memori, dan ringkasan hasil."""
+    timings = dict.fromkeys(PHASES, 0.0)
+    stats = {'allocate': 0.0, 'allocate_calls': 0, 'find_placeable_slots': 0.0, 'find_placeable_slots_calls': 0}
+
+    t0 = time.perf_counter()
+    yard_config = synthetic_yard_config(n_areas, slots_per_area)
+    df_trends = synthetic_trends(n_services, seed=seed)
+    raw_schedule = synthetic_schedule(n_vessels, horizon_days, services=df_trends.index,
+                                      teus_distribution=teus_distribution, seed=seed)
+    timings['generate'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    df_schedule = normalize_schedule(raw_schedule)
+    timings['normalize'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    trends = TrendMatrix.from_frame(df_trends)
+    timings['trends'] = time.perf_counter() - t0
+
+    rules = build_rules(rule_level)
+    with _instrumented_allocation(stats):
+        t0 = time.perf_counter()
+        df_yor, df_recap, _, df_daily_log, _, _ = run_simulation(
+            df_schedule, trends, rules, rule_level, seed=seed, yard_config=yard_config
+        )
+        elapsed = time.perf_counter() - t0
+    # Waktu probe find_placeable_slots bukan bagian dari simulasi.
+    timings['simulate'] = elapsed - stats['find_placeable_slots']
+    timings['allocate'] = stats['allocate']
+    timings['find_placeable_slots'] = stats['find_placeable_slots']
+
+    peak_mb = None
+    if measure_memory:
+        # Pass terpisah: tracemalloc memperlambat eksekusi sehingga tidak dipakai untuk waktu.
+        tracemalloc.start()
+        try:
+            run_simulation(df_schedule, trends, rules, rule_level, seed=seed, yard_config=yard_config)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'case': case_name(n_vessels, n_areas, horizon_days, rule_level),
+        'vessels': n_vessels, 'areas': n_areas, 'slots': n_areas * slots_per_area,
+        'horizon_days': horizon_days, 'rule_level': rule_level, 'seed': seed,
+        'seconds': timings,
+        'allocate_calls': stats['allocate_calls'],
+        'peak_mb': peak_mb,
+        'result': {
+            'box_gagal': int(df_recap['Box Gagal'].sum()),
+            'peak_yor': round(float(df_yor['Rasio Okupansi (%)'].max()), 6),
+            'log_rows': len(df_daily_log),
+        },
+    }
+
+
+def case_name(n_vessels, n_areas, horizon_days, rule_level):
+    return f"v{n_vessels}-a{n_areas}-d{horizon_days}-L{RULE_LEVELS.index(rule_level) + 1}"
+
+
+def run_ladder(ladder=None, repeat=1, **case_kwargs):
+    """Menjalankan tangga skala ``[(kapal, area), ...]``; waktu diambil minimum dari ``repeat`` kali."""
+    results = []
+    for n_vessels, n_areas in ladder or DEFAULT_LADDER:
+        best = None
+        for i in range(repeat):
+            result = run_case(n_vessels, n_areas, measure_memory=(i == 0), **case_kwargs)
+            if best is None:
+                best = result
+            else:
+                best['seconds'] = {phase: min(best['seconds'][phase], result['seconds'][phase]) for phase in PHASES}
+        results.append(best)
+    return results
+
+
+def results_frame(results):
+    """Tabel ringkas hasil benchmark (satu baris per kasus)."""
+    rows = []
+    for result in results:
+        row = {'Kasus': result['case'], 'Kapal': result['vessels'], 'Slot': result['slots'],
+               'Alokasi': result['allocate_calls']}
+        row.update({f'{phase} (s)': round(result['seconds'][phase], 4) for phase in PHASES})
+        row['Puncak Memori (MB)'] = None if result['peak_mb'] is None else round(result['peak_mb'], 2)
+        row['Box Gagal'] = result['result']['box_gagal']
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# --- Baseline ---
+
+def save_baseline(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': BASELINE_VERSION, 'slot_capacity': DEFAULT_SLOT_CAPACITY, 'cases': results}, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Versi baseline tidak didukung: {baseline.get('version')}")
+    return baseline['cases']
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25, min_seconds=0.05):
+    """Membandingkan hasil dengan baseline per kasus & fase.
+
+    Fase ditandai regresi jika lebih lambat dari ``1 + tolerance`` kali baseline
+    dan selisihnya lebih dari ``min_seconds`` (batas noise). Ringkasan hasil
+    simulasi yang berbeda dari baseline ditandai ``Hasil Berubah``.
+    """
+    baseline_by_case = {case['case']: case for case in baseline}
+    rows = []
+    for result in results:
+        base = baseline_by_case.get(result['case'])
+        if base is None:
+            continue
+        result_changed = result['result'] != base['result']
+        for phase in PHASES:
+            now, before = result['seconds'][phase], base['seconds'].get(phase)
+            if before is None:
+                continue
+            rows.append({
+                'Kasus': result['case'], 'Fase': phase,
+                'Baseline (s)': round(before, 4), 'Sekarang (s)': round(now, 4),
+                'Rasio': round(now / before, 3) if before > 0 else np.nan,
+                'Regresi': now > before * (1 + tolerance) and now - before > min_seconds,
+                'Hasil Berubah': result_changed,
+            })
+    return pd.DataFrame(rows, columns=['Kasus', 'Fase', 'Baseline (s)', 'Sekarang (s)', 'Rasio', 'Regresi', 'Hasil Berubah'])
+
+
+# --- Baris Perintah ---
+
+def _parse_ladder(text):
+    ladder = []
+    for step in text.split(','):
+        vessels, _, areas = step.partition('x')
+        ladder.append((int(vessels), int(areas) if areas else max(1, int(vessels) // 4)))
+    return ladder
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m yard_sim.benchmark',
+        description='Benchmark engine alokasi yard dengan jadwal sintetis ber-seed.',
+    )
+    parser.add_argument('--ladder', type=_parse_ladder,
+                        help='tangga skala "KAPALxAREA,..." (mis. 50x12,100x24; default: 50x12,100x24,200x48,400x96)')
+    parser.add_argument('--horizon', type=int, default=60, help='horizon jadwal dalam hari (default: 60)')
+    parser.add_argument('--slots-per-area', type=int, default=40, help='slot per area (default: 40)')
+    parser.add_argument('--level', type=int, choices=[1, 2, 3], default=1, help='level aturan (default: 1)')
+    parser.add_argument('--teus', choices=['lognormal', 'uniform'], default='lognormal', help='distribusi TEUS')
+    parser.add_argument('--seed', type=int, default=0, help='seed generator & simulasi (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='ulangan per kasus, waktu minimum diambil (default: 3)')
+    parser.add_argument('--baseline', help='file baseline JSON untuk dibandingkan')
+    parser.add_argument('--save-baseline', help='simpan hasil sebagai baseline JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='toleransi perlambatan relatif (default: 0.25)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run_ladder(
+        args.ladder, repeat=args.repeat, horizon_days=args.horizon, slots_per_area=args.slots_per_area,
+        rule_level=RULE_LEVELS[args.level - 1], teus_distribution=args.teus, seed=args.seed,
+    )
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(results_frame(results).to_string(index=False))
+
+    exit_code = 0
+    if args.baseline:
+        comparison = compare_to_baseline(results, load_baseline(args.baseline), tolerance=args.tolerance)
+        flagged = comparison[comparison['Regresi'] | comparison['Hasil Berubah']]
+        if comparison.empty:
+            print(f"\nTidak ada kasus yang cocok di baseline {args.baseline}.")
+        elif flagged.empty:
+            print(f"\nTidak ada regresi dibanding {args.baseline}.")
+        else:
+            print(f"\nREGRESI dibanding {args.baseline}:")
+            print(flagged.to_string(index=False))
+            exit_code = 1
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+        print(f"\nBaseline disimpan: {args.save_baseline}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
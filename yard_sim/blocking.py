@@ -0,0 +1,158 @@
+from collections import defaultdict
+
+import numpy as np
+
+_DAY_NS = 86_400_000_000_000
+
+
+def _day_key(timestamp):
+    """Nomor hari integer dari tanggal (lebih murah daripada aritmetika Timestamp)."""
+    return timestamp.value // _DAY_NS
+
+
+class BlockingIndex:
+    """Indeks zona blokir kapal lain yang dipelihara secara inkremental.
+
+    Zona eksklusif harian setiap cluster kapal operasional disimpan sebagai
+    interval indeks global ``[lo, hi)`` di array baris tetap (satu baris per
+    cluster), sehingga pembaruan satu cluster O(1) dan query cukup memfilter
+    array. Zona jarak eksternal (``inter_ship_gap``) hanya berlaku untuk pasangan
+    kapal dengan selisih ETD <= 1 hari, sehingga disimpan terpisah dan
+    dikelompokkan per tanggal ETD.
+
+    Indeks diperbarui ketika kapal mulai operasional (ETA - 8 jam), ketika
+    cluster-nya bertambah, dan ketika kapal berangkat (lewat ETD); pemanggilan
+    ``activate``/``deactivate`` diatur oleh antrian event simulasi.
+    """
+
+    def __init__(self, yard, rules, capacity=64):
+        self.yard = yard
+        self.exclusion_width = rules['daily_exclusion_zone']
+        self.gap_width = rules['inter_ship_gap']
+        self.ignored_vessels = set(rules.get('ignored_vessels', []))
+
+        self.zones = {}
+        self.gap_zones = {}
+        self.by_etd = defaultdict(set)
+
+        # Penyimpanan baris zona eksklusif: (vessel_id, lo, hi, masih_berlaku).
+        self._row_of = {}
+        self._free_rows = []
+        self._row_vessel = np.zeros(capacity, dtype=np.int64)
+        self._row_lo = np.zeros(capacity, dtype=np.int64)
+        self._row_hi = np.zeros(capacity, dtype=np.int64)
+        self._row_live = np.zeros(capacity, dtype=bool)
+        self._rows_used = 0
+
+    # --- Siklus hidup kapal ---
+
+    def activate(self, ship):
+        """Kapal mulai operasional: seluruh cluster-nya mulai memblokir."""
+        if ship['name'] in self.ignored_vessels:
+            return
+        vessel_id = ship['vessel_id']
+        self.zones[vessel_id] = {}
+        self.gap_zones[vessel_id] = {}
+        self.by_etd[_day_key(ship['etd_date'])].add(vessel_id)
+        for cluster_idx in range(len(ship['clusters'])):
+            self.update_cluster(ship, cluster_idx)
+
+    def deactivate(self, ship):
+        """Kapal berangkat: zona blokirnya dihapus."""
+        vessel_id = ship['vessel_id']
+        if vessel_id not in self.zones:
+            return
+        for cluster_idx in self.zones.pop(vessel_id):
+            row = self._row_of.pop((vessel_id, cluster_idx))
+            self._row_live[row] = False
+            self._free_rows.append(row)
+        del self.gap_zones[vessel_id]
+        self.by_etd[_day_key(ship['etd_date'])].discard(vessel_id)
+
+    def update_cluster(self, ship, cluster_idx):
+        """Menyegarkan zona satu cluster setelah cluster tersebut bertambah."""
+        vessel_id = ship['vessel_id']
+        if vessel_id not in self.zones:
+            return
+        cluster = ship['clusters'][cluster_idx]
+        if not cluster:
+            return
+        lo, hi = self._zone_range(cluster, self.exclusion_width)
+        self.zones[vessel_id][cluster_idx] = (lo, hi)
+        row = self._row_of.get((vessel_id, cluster_idx))
+        if row is None:
+            row = self._allocate_row()
+            self._row_of[(vessel_id, cluster_idx)] = row
+        self._row_vessel[row] = vessel_id
+        self._row_lo[row] = lo
+        self._row_hi[row] = hi
+        self._row_live[row] = True
+        if self.gap_width > self.exclusion_width:
+            self.gap_zones[vessel_id][cluster_idx] = self._zone_range(cluster, self.gap_width)
+
+    def _allocate_row(self):
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._rows_used == len(self._row_live):
+            grow = len(self._row_live)
+            self._row_vessel = np.concatenate((self._row_vessel, np.zeros(grow, dtype=np.int64)))
+            self._row_lo = np.concatenate((self._row_lo, np.zeros(grow, dtype=np.int64)))
+            self._row_hi = np.concatenate((self._row_hi, np.zeros(grow, dtype=np.int64)))
+            self._row_live = np.concatenate((self._row_live, np.zeros(grow, dtype=bool)))
+        self._rows_used += 1
+        return self._rows_used - 1
+
+    def _zone_range(self, cluster, width):
+        cluster_area = cluster[0][0]
+        area_size = self.yard.yard_config[cluster_area]
+        min_slot_num = min(s[1] for s in cluster)
+        max_slot_num = max(s[1] for s in cluster)
+        start_zone = max(1, min_slot_num - width)
+        end_zone = min(area_size, max_slot_num + width)
+        return self.yard.area_range(cluster_area, start_zone, end_zone)
+
+    # --- Query ---
+
+    def blocked_intervals(self, current_ship):
+        """Interval ``(lo, hi)`` yang terblokir kapal lain untuk ``current_ship`` (boleh tumpang tindih)."""
+        vessel_id = current_ship['vessel_id']
+        n = self._rows_used
+        keep = self._row_live[:n] & (self._row_vessel[:n] != vessel_id)
+        los = [self._row_lo[:n][keep]]
+        his = [self._row_hi[:n][keep]]
+
+        etd_day = _day_key(current_ship['etd_date'])
+        for day in (etd_day - 1, etd_day, etd_day + 1):
+            for other_id in self.by_etd.get(day, ()):
+                if other_id == vessel_id or not self.gap_zones[other_id]:
+                    continue
+                gap_lo, gap_hi = zip(*self.gap_zones[other_id].values())
+                los.append(np.array(gap_lo, dtype=np.int64))
+                his.append(np.array(gap_hi, dtype=np.int64))
+        return np.concatenate(los), np.concatenate(his)
+
+    def blockers(self, current_ship, free):
+        """Id kapal lain yang zonanya menutup minimal satu slot kosong (mask ``free``) untuk ``current_ship``."""
+        free_before = np.concatenate(([0], np.cumsum(free, dtype=np.int64)))
+        vessel_id = current_ship['vessel_id']
+        n = self._rows_used
+        keep = self._row_live[:n] & (self._row_vessel[:n] != vessel_id)
+        covering = free_before[self._row_hi[:n][keep]] > free_before[self._row_lo[:n][keep]]
+        found = set(self._row_vessel[:n][keep][covering].tolist())
+
+        etd_day = _day_key(current_ship['etd_date'])
+        for day in (etd_day - 1, etd_day, etd_day + 1):
+            for other_id in self.by_etd.get(day, ()):
+                if other_id == vessel_id or other_id in found:
+                    continue
+                if any(free_before[hi] > free_before[lo] for lo, hi in self.gap_zones[other_id].values()):
+                    found.add(other_id)
+        return found
+
+    def blocked_mask(self, current_ship):
+        """Mask slot yang terblokir kapal lain untuk ``current_ship`` hari ini."""
+        los, his = self.blocked_intervals(current_ship)
+        delta = np.zeros(self.yard.total_slots + 1, dtype=np.int64)
+        np.add.at(delta, los, 1)
+        np.add.at(delta, his, -1)
+        return np.cumsum(delta[:-1]) > 0
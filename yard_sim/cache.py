@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from .simulation import DEFAULT_SLOT_CAPACITY, DEFAULT_YARD_CONFIG, run_simulation
+from .trends import as_trend_matrix
+
+# Naikkan jika format hasil run_simulation berubah agar cache disk lama tidak terpakai.
+CACHE_VERSION = 2
+SCHEDULE_KEY_COLUMNS = ['VESSEL', 'SERVICE', 'OPEN STACKING', 'ETA', 'ETD', 'TOTAL BOX (TEUS)']
+
+
+def _hash_frame(digest, df):
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(json.dumps([str(t) for t in df.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+
+
+def simulation_key(df_schedule, df_trends, rules, seed, yard_config=None, slot_capacity=None):
+    """Hash SHA-256 dari jadwal ternormalisasi, tabel tren, aturan, seed, dan layout yard."""
+    digest = hashlib.sha256(f"yard_sim-v{CACHE_VERSION}".encode())
+    schedule = df_schedule[[c for c in SCHEDULE_KEY_COLUMNS if c in df_schedule.columns]].reset_index(drop=True)
+    _hash_frame(digest, schedule)
+    _hash_frame(digest, as_trend_matrix(df_trends).to_frame())
+    normalized_rules = dict(rules)
+    normalized_rules['ignored_vessels'] = sorted(str(v) for v in rules.get('ignored_vessels', []))
+    digest.update(json.dumps(normalized_rules, sort_keys=True, default=str).encode())
+    layout = [yard_config or DEFAULT_YARD_CONFIG, slot_capacity or DEFAULT_SLOT_CAPACITY]
+    digest.update(json.dumps(layout + [seed]).encode())
+    return digest.hexdigest()
+
+
+class SimulationCache:
+    """Cache hasil ``run_simulation`` berbasis isi input.
+
+    Tier memori berukuran tetap (LRU, ``max_entries``) dan aman dipakai dari
+    banyak thread/sesi Streamlit. Jika ``cache_dir`` diisi, hasil juga disimpan
+    sebagai pickle di disk (maks. ``max_disk_entries`` file terbaru) sehingga
+    bertahan setelah server di-restart. Hasil dari cache dipakai bersama;
+    perlakukan sebagai read-only.
+    """
+
+    def __init__(self, max_entries=16, cache_dir=None, max_disk_entries=256):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        value = self._load_from_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        self._save_to_disk(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_run(self, df_schedule, df_trends, rules, rule_level, seed, checkpoints=None, progress=None,
+                   yard_config=None, slot_capacity=None):
+        """Hasil ``run_simulation`` dari cache, atau menjalankannya lalu menyimpan hasilnya.
+
+        Simulasi tanpa seed (``seed=None``) tidak deterministik sehingga tidak di-cache.
+        ``checkpoints`` dan ``progress`` diteruskan ke ``run_simulation`` saat cache miss;
+        ``yard_config``/``slot_capacity`` memilih layout yard (ikut menjadi kunci cache).
+        """
+        def run():
+            return run_simulation(
+                df_schedule, df_trends, rules, rule_level, seed=seed, yard_config=yard_config,
+                slot_capacity=slot_capacity, checkpoints=checkpoints, progress=progress
+            )
+
+        if seed is None:
+            return run()
+        key = simulation_key(df_schedule, df_trends, rules, seed, yard_config, slot_capacity)
+        result = self.get(key)
+        if result is None:
+            result = run()
+            self.put(key, result)
+        return result
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- Tier disk ---
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def _load_from_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        os.utime(path)
+        return value
+
+    def _save_to_disk(self, key, value):
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        files = []
+        for path in self.cache_dir.glob('*.pkl'):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort(reverse=True)
+        for _, stale in files[self.max_disk_entries:]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,150 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+_VESSEL_FIELDS = ('service', 'total_boxes', 'start_date', 'eta_date', 'etd_date')
+
+
+def _first_event_date(signature):
+    """Tanggal event paling awal kapal (buka stacking atau keberangkatan), lihat ``build_vessel_events``."""
+    _, _, start_date, _, etd_date = signature
+    return min(start_date, etd_date + pd.Timedelta(days=1))
+
+
+def _copy_state(state):
+    """Salinan state checkpoint; slot cluster berupa tuple immutable sehingga cukup list-nya yang disalin."""
+    yard, blocking = copy.deepcopy((state['yard'], state['blocking']))
+    vessels = {
+        vessel_id: ([list(cluster) for cluster in clusters], remaining_capacity)
+        for vessel_id, (clusters, remaining_capacity) in state['vessels'].items()
+    }
+    return dict(state, yard=yard, blocking=blocking, vessels=vessels, active=list(state['active']))
+
+
+class SimulationCheckpoints:
+    """Checkpoint berkala untuk simulasi ulang inkremental.
+
+    Dipakai lewat ``run_simulation(..., checkpoints=store)``. Setiap
+    ``interval`` hari, state awal hari (yard, indeks blokir, cluster &
+    ``remaining_capacity`` kapal, kapal aktif, state RNG) disalin. Pada run
+    berikutnya dengan objek yang sama, input dibandingkan dengan run
+    sebelumnya: jika hanya data kapal (ETA/ETD/TEUS/service), kapal baru di akhir
+    jadwal, atau ``ignored_vessels`` yang berubah, simulasi dilanjutkan dari
+    checkpoint terakhir sebelum event paling awal kapal yang terdampak.
+    Perubahan lain (aturan, seed, tren, layout, tanggal mulai, kapal dihapus
+    atau diurutkan ulang) menjalankan simulasi penuh.
+
+    ``last_start_day`` berisi indeks hari awal run terakhir (0 = simulasi penuh).
+    """
+
+    def __init__(self, interval=7):
+        self.interval = interval
+        self.last_start_day = None
+        self.daily_log = None
+        self.occupied_per_day = None
+        self.snapshots = None
+        self._inputs = None
+        self._states = {}
+
+    @property
+    def inputs(self):
+        """Ringkasan input run terakhir (lihat ``describe_inputs``), ``None`` sebelum run pertama."""
+        return self._inputs
+
+    # --- Dipanggil oleh run_simulation ---
+
+    def describe_inputs(self, vessels, yard, trends, rules, seed, date_range):
+        return {
+            'vessels': {name: tuple(ship[field] for field in _VESSEL_FIELDS) for name, ship in vessels.items()},
+            'vessel_names': list(yard.vessel_names[1:]),
+            'ignored_vessels': frozenset(rules.get('ignored_vessels', [])),
+            'rules': {key: value for key, value in rules.items() if key != 'ignored_vessels'},
+            'seed': seed,
+            'yard_config': dict(yard.yard_config),
+            'slot_capacity': yard.slot_capacity,
+            'trends': trends,
+            'start_date': date_range[0] if len(date_range) else None,
+        }
+
+    def _compatible(self, inputs):
+        previous = self._inputs
+        if previous is None or inputs['seed'] is None or not self._states:
+            return False
+        if any(inputs[key] != previous[key] for key in ('seed', 'rules', 'yard_config', 'slot_capacity', 'start_date')):
+            return False
+        old_names, new_names = previous['vessel_names'], inputs['vessel_names']
+        if new_names[:len(old_names)] != old_names:
+            return False
+        if len(new_names) + 1 > np.iinfo(self.snapshots.dtype).max:
+            return False
+        old_trends, new_trends = previous['trends'], inputs['trends']
+        return old_trends is new_trends or (
+            old_trends.services == new_trends.services and np.array_equal(old_trends.matrix, new_trends.matrix)
+        )
+
+    def first_affected_day(self, inputs):
+        """Indeks hari pertama yang bisa berbeda dari run sebelumnya (``None`` jika tidak ada)."""
+        previous = self._inputs
+        affected = set(previous['ignored_vessels'].symmetric_difference(inputs['ignored_vessels']))
+        for name, signature in inputs['vessels'].items():
+            if previous['vessels'].get(name) != signature:
+                affected.add(name)
+        dates = [_first_event_date(versions[name])
+                 for versions in (previous['vessels'], inputs['vessels'])
+                 for name in affected if name in versions]
+        if not dates:
+            return None
+        return max(0, (min(dates) - inputs['start_date']).days)
+
+    def restore(self, inputs, num_days):
+        """``(hari, state)`` salinan checkpoint untuk melanjutkan, atau ``None`` untuk simulasi penuh."""
+        if not self._compatible(inputs):
+            return None
+        affected_day = self.first_affected_day(inputs)
+        limit = num_days - 1 if affected_day is None else min(affected_day, num_days - 1)
+        candidates = [day for day in self._states if 0 < day <= limit]
+        if not candidates:
+            return None
+        day = max(candidates)
+        return day, _copy_state(self._states[day])
+
+    def begin(self, inputs, first_day):
+        self._inputs = inputs
+        self.last_start_day = first_day
+        # Checkpoint setelah hari awal akan ditulis ulang oleh run ini.
+        self._states = {day: state for day, state in self._states.items() if day < first_day}
+
+    def is_due(self, day):
+        return day % self.interval == 0
+
+    def save(self, day, yard, blocking, vessels, active_ships, rng, daily_log):
+        # Hanya kapal yang sudah mulai (aktif/pernah dialokasi) yang state-nya disimpan;
+        # kapal yang belum mulai selalu memakai state awal dari jadwal terbaru.
+        started = {
+            ship['vessel_id']: (ship['clusters'], ship['remaining_capacity'])
+            for ship in vessels.values()
+            if ship['vessel_id'] in active_ships or ship['remaining_capacity'] or any(ship['clusters'])
+        }
+        self._states[day] = _copy_state({
+            'yard': yard, 'blocking': blocking, 'vessels': started,
+            'active': list(active_ships), 'rng': rng.getstate(), 'log_rows': len(daily_log),
+        })
+
+    def finish(self, daily_log, occupied_per_day, snapshots):
+        self.daily_log = daily_log
+        self.occupied_per_day = occupied_per_day.copy()
+        self.snapshots = snapshots
+
+    def clear(self):
+        self.__init__(self.interval)
+
+    def fork(self):
+        """Salinan store untuk run percobaan (mis. what-if) yang tidak mengubah checkpoint store ini.
+
+        Checkpoint, log, dan snapshot dipakai bersama: run berikutnya hanya
+        membaca salinannya (``restore``/``head``) dan mengganti atribut store sendiri.
+        """
+        forked = copy.copy(self)
+        forked._states = dict(self._states)
+        return forked
@@ -0,0 +1,133 @@
+"""Entry point baris perintah: ``python -m yard_sim SCHEDULE.xlsx [opsi]``."""
+
+import argparse
+import sys
+
+OUTPUT_FORMATS = ['csv', 'xlsx', 'parquet']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m yard_sim',
+        description='Menjalankan simulasi alokasi container yard tanpa UI Streamlit.',
+    )
+    parser.add_argument('schedule', help='file Vessel Schedule (.xlsx, .csv, atau .parquet)')
+    parser.add_argument('-o', '--output-dir', default='output', help='folder hasil (default: output)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='format tabel hasil')
+    parser.add_argument('--occupancy', action='store_true',
+                        help='ikut menulis matriks okupansi tanggal x slot (occupancy.<format>)')
+    parser.add_argument('--trends', help='path file atau URL stacking trend (default: stacking_trends.xlsx di repository)')
+    parser.add_argument('--level', type=int, choices=[1, 2, 3], default=1, help='level aturan (default: 1)')
+    parser.add_argument('--intra-ship-gap', type=int, help='jarak internal kapal (default mengikuti level)')
+    parser.add_argument('--daily-exclusion-zone', type=int, help='zona eksklusif harian (default mengikuti level)')
+    parser.add_argument('--inter-ship-gap', type=int, help='jarak eksternal kapal (default mengikuti level)')
+    parser.add_argument('--placement', metavar='SKOR',
+                        help='fungsi skor pemilihan blok baru, mis. best_fit atau nearest (default: best_fit)')
+    parser.add_argument('--ignore', action='append', default=[], metavar='VESSEL',
+                        help='kapal yang diabaikan restriksinya (boleh diulang)')
+    parser.add_argument('--seed', type=int, help='seed pemilihan blok agar hasil dapat diulang')
+    parser.add_argument('--cache-dir', help='folder cache hasil simulasi (butuh --seed)')
+    parser.add_argument('--layouts', help='file layout yard per terminal (.json, .csv, atau .xlsx)')
+    parser.add_argument('--terminal', help='hanya simulasikan terminal ini dari --layouts '
+                                           '(default: semua terminal paralel, hasil per subfolder)')
+    return parser
+
+
+def write_tables(tables, output_dir, fmt='csv'):
+    """Menulis tabel hasil ``{nama: DataFrame | chunks}`` ke ``output_dir``; mengembalikan path file."""
+    from .export import export_tables
+
+    return export_tables(tables, output_dir, fmt)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Import berat (pandas/NumPy) baru dimuat setelah argumen valid.
+    from .placement import placement_scorer
+    from .schedule import read_schedule
+    from .simulation import RULE_LEVELS, build_rules, run_simulation
+    from .trends import load_trend_matrix
+
+    try:
+        placement_scorer(args.placement)
+    except ValueError as e:
+        parser.error(str(e))
+
+    rule_level = RULE_LEVELS[args.level - 1]
+    rules = build_rules(
+        rule_level,
+        intra_ship_gap=args.intra_ship_gap,
+        daily_exclusion_zone=args.daily_exclusion_zone,
+        inter_ship_gap=args.inter_ship_gap,
+        ignored_vessels=args.ignore,
+        placement_score=args.placement,
+    )
+    df_schedule = read_schedule(args.schedule)
+    if df_schedule.empty:
+        print(f"Tidak ada baris jadwal yang valid di {args.schedule}.", file=sys.stderr)
+        return 1
+    df_trends = load_trend_matrix(args.trends)
+
+    layout_kwargs = {}
+    if args.layouts:
+        from .layouts import read_layouts
+        from .terminals import terminal_schedule
+
+        layouts = read_layouts(args.layouts)
+        if args.terminal is None and len(layouts) > 1:
+            return run_all_terminals(args, df_schedule, df_trends, rules, rule_level, layouts)
+        terminal = args.terminal or next(iter(layouts))
+        if terminal not in layouts:
+            print(f"Terminal '{terminal}' tidak ada di {args.layouts}.", file=sys.stderr)
+            return 1
+        if args.terminal is not None:
+            df_schedule = terminal_schedule(df_schedule, terminal)
+            if df_schedule.empty:
+                print(f"Tidak ada kapal untuk terminal '{terminal}'.", file=sys.stderr)
+                return 1
+        layout_kwargs = {'yard_config': layouts[terminal].yard_config, 'slot_capacity': layouts[terminal].slot_capacity}
+
+    if args.cache_dir:
+        from .cache import SimulationCache
+        results = SimulationCache(max_entries=1, cache_dir=args.cache_dir).get_or_run(
+            df_schedule, df_trends, rules, rule_level, args.seed, **layout_kwargs
+        )
+    else:
+        results = run_simulation(df_schedule, df_trends, rules, rule_level, seed=args.seed, **layout_kwargs)
+    from .export import result_tables
+
+    df_yor, df_recap = results[0], results[1]
+    tables = result_tables(results, include_occupancy=args.occupancy)
+    for path in write_tables(tables, args.output_dir, args.format):
+        print(f"Ditulis: {path}")
+    print(
+        f"{rule_level}: {int(df_recap['Box Gagal'].sum())} box gagal, "
+        f"puncak YOR {df_yor['Rasio Okupansi (%)'].max():.1f}%"
+    )
+    return 0
+
+
+def run_all_terminals(args, df_schedule, df_trends, rules, rule_level, layouts):
+    """Semua terminal paralel: hasil per terminal di ``<output>/<terminal>/``, YOR dan rekap gabungan di ``<output>``."""
+    from pathlib import Path
+
+    from .export import result_tables
+    from .terminals import run_terminals
+
+    try:
+        multi = run_terminals(df_schedule, df_trends, rules, rule_level, layouts, seed=args.seed)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for name, results in multi.results.items():
+        tables = result_tables(results, include_occupancy=args.occupancy)
+        for path in write_tables(tables, Path(args.output_dir) / name, args.format):
+            print(f"Ditulis: {path}")
+    combined = {'yor': multi.combined_yor(), 'recap': multi.combined_recap()}
+    for path in write_tables(combined, args.output_dir, args.format):
+        print(f"Ditulis: {path}")
+    for row in multi.terminal_summary().to_dict('records'):
+        print(f"{row['Terminal']} ({rule_level}): {row['Total Box Gagal']} box gagal, puncak YOR {row['Puncak YOR (%)']:.1f}%")
+    return 0
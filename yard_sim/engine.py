@@ -0,0 +1,229 @@
+import numpy as np
+
+_INT64_MIN = np.iinfo(np.int64).min
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def subtract_intervals(starts, ends, cut_starts, cut_ends):
+    """Interval ``[starts, ends)`` (terurut, saling lepas) dikurangi gabungan interval potong.
+
+    Interval potong digabung dulu, lalu setiap run dipotong oleh celah di antara
+    gabungan tersebut lewat ``searchsorted``, sehingga biayanya bergantung pada
+    jumlah interval, bukan ukuran yard. Run yang bersentuhan tetap terpisah;
+    interval potong kosong (``cut_ends <= cut_starts``) diabaikan.
+    """
+    nonempty = cut_ends > cut_starts
+    if not nonempty.all():
+        cut_starts, cut_ends = cut_starts[nonempty], cut_ends[nonempty]
+    if len(cut_starts) == 0:
+        return starts.copy(), ends.copy()
+    order = np.argsort(cut_starts, kind='stable')
+    cut_starts = cut_starts[order]
+    cut_ends = np.maximum.accumulate(cut_ends[order])
+    # group_edge[i]: interval potong ke-i memulai gabungan baru (ke-i - 1 mengakhirinya).
+    num_cuts = len(cut_starts)
+    group_edge = np.empty(num_cuts + 1, dtype=bool)
+    group_edge[0] = group_edge[num_cuts] = True
+    np.greater(cut_starts[1:], cut_ends[:-1], out=group_edge[1:num_cuts])
+    merged_starts = cut_starts[group_edge[:num_cuts]]
+
+    # Celah yang diizinkan di antara interval potong gabungan.
+    gap_starts = np.empty(len(merged_starts) + 1, dtype=np.int64)
+    gap_starts[0] = _INT64_MIN
+    gap_starts[1:] = cut_ends[group_edge[1:]]
+    gap_ends = np.empty(len(merged_starts) + 1, dtype=np.int64)
+    gap_ends[:-1] = merged_starts
+    gap_ends[-1] = _INT64_MAX
+    first_gap = np.searchsorted(gap_ends, starts, side='right')
+    counts = np.maximum(np.searchsorted(gap_starts, ends, side='left') - first_gap, 0)
+    run_idx = np.repeat(np.arange(len(starts)), counts)
+    gap_idx = np.repeat(first_gap - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    out_starts = np.maximum(starts[run_idx], gap_starts[gap_idx])
+    out_ends = np.minimum(ends[run_idx], gap_ends[gap_idx])
+    keep = out_ends > out_starts
+    return out_starts[keep], out_ends[keep]
+
+
+class FreeRunIndex:
+    """Daftar terurut run slot kosong kontigu ``[start, end)`` per area (indeks global).
+
+    Run tidak pernah melewati batas area. Posisi run dicari dengan
+    ``searchsorted``; alokasi di ujung run dan pelepasan yang menempel ke satu
+    tetangga hanya menggeser batas run di tempat. Hanya pemecahan run,
+    penghapusan run, atau run baru yang menyusun ulang array (O(jumlah run)).
+    """
+
+    def __init__(self, area_offsets, area_sizes, total_slots):
+        nonempty = area_sizes > 0
+        self.starts = area_offsets[nonempty].astype(np.int64)
+        self.ends = (area_offsets + area_sizes)[nonempty].astype(np.int64)
+        self.area_start = np.zeros(total_slots + 1, dtype=bool)
+        self.area_start[area_offsets] = True
+        self.area_start[total_slots] = True
+
+    def occupy(self, lo, hi):
+        """Menandai ``[lo, hi)`` (harus kosong, dalam satu area) sebagai terpakai."""
+        i = int(np.searchsorted(self.starts, lo, side='right')) - 1
+        start, end = self.starts[i], self.ends[i]
+        if start < lo and hi < end:
+            self._replace(i, i + 1, [(start, lo), (hi, end)])
+        elif start < lo:
+            self.ends[i] = lo
+        elif hi < end:
+            self.starts[i] = hi
+        else:
+            self._replace(i, i + 1, [])
+
+    def vacate(self, lo, hi):
+        """Menandai ``[lo, hi)`` (dalam satu area) sebagai kosong, menggabung run tetangga."""
+        i = int(np.searchsorted(self.starts, lo))
+        merge_before = i > 0 and self.ends[i - 1] == lo and not self.area_start[lo]
+        merge_after = i < len(self.starts) and self.starts[i] == hi and not self.area_start[hi]
+        if merge_before and merge_after:
+            self.ends[i - 1] = self.ends[i]
+            self._replace(i, i + 1, [])
+        elif merge_before:
+            self.ends[i - 1] = hi
+        elif merge_after:
+            self.starts[i] = lo
+        else:
+            self._replace(i, i, [(lo, hi)])
+
+    def rebuild(self, free):
+        """Menyusun ulang daftar run dari mask slot kosong ``free``."""
+        free = np.asarray(free, dtype=bool)
+        prev_free = np.concatenate(([False], free[:-1]))
+        next_free = np.concatenate((free[1:], [False]))
+        self.starts = np.flatnonzero(free & (~prev_free | self.area_start[:-1])).astype(np.int64)
+        self.ends = np.flatnonzero(free & (~next_free | self.area_start[1:])).astype(np.int64) + 1
+
+    def _replace(self, i, j, pieces):
+        self.starts = np.concatenate((self.starts[:i], [a for a, _ in pieces], self.starts[j:])).astype(np.int64)
+        self.ends = np.concatenate((self.ends[:i], [b for _, b in pieces], self.ends[j:])).astype(np.int64)
+
+    def lengths(self):
+        return self.ends - self.starts
+
+
+class YardState:
+    """Status yard berbasis array NumPy yang diindeks dengan offset slot global.
+
+    Setiap slot diberi indeks global ``offset_area + nomor_slot - 1`` (urutan
+    area mengikuti ``yard_config``). Kepemilikan slot disimpan sebagai id kapal
+    integer (0 = kosong) dan jumlah slot terpakai per area selalu diperbarui
+    setiap kali slot dialokasikan atau dilepas.
+    """
+
+    FREE = 0
+
+    def __init__(self, yard_config, slot_capacity):
+        self.yard_config = dict(yard_config)
+        self.slot_capacity = slot_capacity
+        self.areas = list(self.yard_config.keys())
+        self.area_sizes = np.array([self.yard_config[a] for a in self.areas], dtype=np.int64)
+        self.area_offsets = np.concatenate(([0], np.cumsum(self.area_sizes)[:-1])).astype(np.int64)
+        self.area_index = {area: i for i, area in enumerate(self.areas)}
+        self.area_offset = dict(zip(self.areas, self.area_offsets.tolist()))
+        self.total_slots = int(self.area_sizes.sum())
+
+        # Lookup per slot global: indeks area dan nomor slot (1-based) di dalam area.
+        self.slot_area = np.repeat(np.arange(len(self.areas)), self.area_sizes)
+        self.slot_number = np.arange(self.total_slots) - self.area_offsets[self.slot_area] + 1
+
+        self.owner = np.zeros(self.total_slots, dtype=np.int32)
+        self.free_runs = FreeRunIndex(self.area_offsets, self.area_sizes, self.total_slots)
+        self.area_occupied = np.zeros(len(self.areas), dtype=np.int64)
+        self.occupied_count = 0
+
+        self.vessel_names = [None]
+        self.vessel_ids = {}
+
+    # --- Registrasi kapal ---
+
+    def register_vessel(self, name):
+        """Mengembalikan id integer kapal, mendaftarkannya jika belum ada."""
+        if name not in self.vessel_ids:
+            self.vessel_ids[name] = len(self.vessel_names)
+            self.vessel_names.append(name)
+        return self.vessel_ids[name]
+
+    # --- Konversi slot <-> indeks global ---
+
+    def slot_index(self, slot):
+        area, number = slot
+        return self.area_offset[area] + number - 1
+
+    def slot_at(self, index):
+        return (self.areas[self.slot_area[index]], int(self.slot_number[index]))
+
+    def slots_at(self, indices):
+        return [self.slot_at(i) for i in indices]
+
+    def area_range(self, area, start_number, end_number):
+        """Rentang indeks global (start, stop) untuk nomor slot inklusif di satu area."""
+        offset = int(self.area_offsets[self.area_index[area]])
+        return offset + start_number - 1, offset + end_number
+
+    # --- Mutasi status ---
+
+    def contiguous_ranges(self, indices):
+        """Memecah indeks (terurut, unik) menjadi rentang ``[lo, hi)`` yang tidak melewati batas area."""
+        breaks = np.flatnonzero((np.diff(indices) != 1) | (np.diff(self.slot_area[indices]) != 0)) + 1
+        starts = indices[np.concatenate(([0], breaks))]
+        ends = indices[np.concatenate((breaks - 1, [len(indices) - 1]))] + 1
+        return zip(starts.tolist(), ends.tolist())
+
+    def allocate_range(self, lo, hi, vessel_id):
+        """Alokasi rentang kontigu ``[lo, hi)``; jalur cepat untuk blok di dalam satu area."""
+        area = self.slot_area[lo]
+        if hi <= lo or self.slot_area[hi - 1] != area:
+            self.allocate(np.arange(lo, hi), vessel_id)
+            return
+        self.owner[lo:hi] = vessel_id
+        self.free_runs.occupy(lo, hi)
+        self.area_occupied[area] += hi - lo
+        self.occupied_count += hi - lo
+
+    def allocate(self, indices, vessel_id):
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        if indices.size == 0:
+            return
+        self.owner[indices] = vessel_id
+        for lo, hi in self.contiguous_ranges(indices):
+            self.free_runs.occupy(lo, hi)
+        self.area_occupied += np.bincount(self.slot_area[indices], minlength=len(self.areas))
+        self.occupied_count += int(indices.size)
+
+    def release(self, indices, vessel_id):
+        """Mengosongkan slot yang masih dimiliki ``vessel_id``."""
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        indices = indices[self.owner[indices] == vessel_id]
+        if indices.size == 0:
+            return
+        self.owner[indices] = self.FREE
+        for lo, hi in self.contiguous_ranges(indices):
+            self.free_runs.vacate(lo, hi)
+        self.area_occupied -= np.bincount(self.slot_area[indices], minlength=len(self.areas))
+        self.occupied_count -= int(indices.size)
+
+    def load_owner(self, owner):
+        """Mengganti seluruh kepemilikan slot (mis. dari snapshot) dan menyusun ulang indeksnya."""
+        self.owner = np.asarray(owner, dtype=np.int32).copy()
+        occupied = self.owner != self.FREE
+        self.area_occupied = np.bincount(self.slot_area[occupied], minlength=len(self.areas)).astype(np.int64)
+        self.occupied_count = int(occupied.sum())
+        self.free_runs.rebuild(~occupied)
+
+    # --- Query ---
+
+    def free_mask(self):
+        return self.owner == self.FREE
+
+    def to_status_dict(self, owner=None):
+        """Format lama ``{(area, nomor_slot): nama_kapal | None}`` untuk UI."""
+        owner = self.owner if owner is None else owner
+        names = self.vessel_names
+        return {
+            (self.areas[a], int(n)): names[o]
+            for a, n, o in zip(self.slot_area, self.slot_number, owner)
+        }
@@ -0,0 +1,51 @@
+import heapq
+import itertools
+
+import pandas as pd
+
+# Jenis event; pada tanggal yang sama diproses sesuai urutan nilai ini
+# (slot kapal yang berangkat dilepas sebelum kapal lain mulai dialokasikan).
+DEPARTURE = 0
+OPEN_STACKING = 1
+OPERATIONAL_START = 2
+
+
+class EventQueue:
+    """Antrian prioritas (heap) event kapal yang diurutkan per tanggal."""
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, event_date, kind, ship):
+        heapq.heappush(self._heap, (event_date, kind, next(self._counter), ship))
+
+    def pop_due(self, current_date):
+        """Mengeluarkan semua event dengan tanggal <= ``current_date`` secara berurutan."""
+        while self._heap and self._heap[0][0] <= current_date:
+            event_date, kind, _, ship = heapq.heappop(self._heap)
+            yield kind, ship
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def operational_start_date(ship):
+    """Tanggal pertama kapal memblokir area (ETA - 8 jam, dibulatkan ke atas ke hari)."""
+    return (ship['eta_date'] - pd.Timedelta(hours=8)).ceil('D')
+
+
+def build_vessel_events(vessels):
+    """Event buka stacking, mulai operasional, dan keberangkatan untuk semua kapal.
+
+    Kapal aktif pada tanggal D jika start <= D <= ETD; slotnya dilepas pada ETD + 1.
+    """
+    queue = EventQueue()
+    for ship in vessels.values():
+        if ship['start_date'] <= ship['etd_date']:
+            queue.push(ship['start_date'], OPEN_STACKING, ship)
+            blocking_from = max(ship['start_date'], operational_start_date(ship))
+            if blocking_from <= ship['etd_date']:
+                queue.push(blocking_from, OPERATIONAL_START, ship)
+        queue.push(ship['etd_date'] + pd.Timedelta(days=1), DEPARTURE, ship)
+    return queue
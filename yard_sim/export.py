@@ -0,0 +1,212 @@
+"""Export hasil simulasi secara streaming ke CSV, Excel (openpyxl write-only) dan Parquet.
+
+Tabel ditulis per chunk baris, dan matriks okupansi tanggal x slot dibangun
+per blok hari dari ``YardSnapshots``, sehingga memori tetap terbatas untuk
+horizon panjang dan yard besar.
+"""
+
+import contextlib
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESULT_TABLES = ['yor', 'recap', 'map', 'daily_log']
+OCCUPANCY_TABLE = 'occupancy'
+EXPORT_FORMATS = ['csv', 'xlsx', 'parquet']
+SHEET_TITLES = {
+    'yor': 'YOR Harian', 'recap': 'Rekap Alokasi', 'map': 'Peta Alokasi',
+    'daily_log': 'Log Harian', 'occupancy': 'Okupansi Slot',
+}
+DEFAULT_CHUNK_ROWS = 5000
+DEFAULT_CHUNK_DAYS = 92
+
+# Batas lembar Excel (termasuk baris header / kolom tanggal).
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLUMNS = 16_384
+
+
+# --- Sumber Chunk ---
+
+def frame_chunks(df, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Potongan ``df`` per ``chunk_rows`` baris; DataFrame kosong tetap menghasilkan satu chunk (header)."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def slot_labels(yard):
+    """Label kolom slot global, mis. ``"A01:1"``."""
+    return [f"{yard.areas[area]}:{number}" for area, number in zip(yard.slot_area.tolist(), yard.slot_number.tolist())]
+
+
+def occupancy_chunks(snapshots, chunk_days=DEFAULT_CHUNK_DAYS):
+    """Matriks okupansi (baris tanggal, kolom slot, isi nama kapal atau kosong) per blok ``chunk_days`` hari.
+
+    Kolom slot berupa kategori nama kapal (kode = id kapal - 1) sehingga tiap
+    blok kecil di memori dan ditulis sebagai kolom dictionary di Parquet.
+    """
+    yard = snapshots.yard
+    columns = slot_labels(yard)
+    vessel_names = pd.Index(yard.vessel_names[1:])
+    dates, block = [], []
+
+    def build():
+        codes = np.stack(block).astype(np.int32) - 1 if block else np.zeros((0, yard.total_slots), dtype=np.int32)
+        df = pd.DataFrame({
+            column: pd.Categorical.from_codes(codes[:, i], categories=vessel_names)
+            for i, column in enumerate(columns)
+        }, columns=columns)
+        df.insert(0, 'Tanggal', pd.DatetimeIndex(dates))
+        return df
+
+    for current_date, owner in snapshots.iter_owners():
+        dates.append(current_date)
+        block.append(owner.copy())
+        if len(block) == chunk_days:
+            yield build()
+            dates, block = [], []
+    if block or not snapshots.dates:
+        yield build()
+
+
+def result_tables(results, include_occupancy=True, chunk_rows=DEFAULT_CHUNK_ROWS, chunk_days=DEFAULT_CHUNK_DAYS):
+    """``{nama: iterator chunk DataFrame}`` dari tuple hasil ``run_simulation`` (setiap iterator sekali pakai)."""
+    df_yor, df_recap, df_map, df_daily_log, snapshots, _ = results
+    tables = {
+        name: frame_chunks(df, chunk_rows)
+        for name, df in zip(RESULT_TABLES, [df_yor, df_recap, df_map, df_daily_log])
+    }
+    if include_occupancy:
+        tables[OCCUPANCY_TABLE] = occupancy_chunks(snapshots, chunk_days)
+    return tables
+
+
+def _as_chunks(table):
+    return frame_chunks(table) if isinstance(table, pd.DataFrame) else table
+
+
+# --- Penulis per Format ---
+
+def write_csv(chunks, target):
+    """Menulis chunk ke satu file/buffer CSV (header sekali)."""
+    header = True
+    with open(target, 'w', newline='', encoding='utf-8') if isinstance(target, (str, Path)) else contextlib.nullcontext(target) as f:
+        for chunk in _as_chunks(chunks):
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+
+
+def _excel_rows(chunk):
+    """Baris chunk sebagai list nilai Python; NaN/NaT menjadi sel kosong."""
+    return chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+
+
+def write_excel(tables, target):
+    """Menulis ``{nama: chunks}`` ke satu workbook write-only, satu sheet per tabel.
+
+    Tabel yang melebihi batas baris Excel dilanjutkan di sheet ``"<judul> (2)"`` dst.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, chunks in tables.items():
+        title = SHEET_TITLES.get(name, name)[:25]
+        sheet, part, rows_left = None, 0, 0
+        for chunk in _as_chunks(chunks):
+            if chunk.shape[1] > EXCEL_MAX_COLUMNS:
+                raise ValueError(
+                    f"Tabel '{name}' memiliki {chunk.shape[1]} kolom, melebihi batas Excel "
+                    f"({EXCEL_MAX_COLUMNS}). Gunakan format Parquet."
+                )
+            header = list(map(str, chunk.columns))
+            if sheet is None:
+                sheet, part, rows_left = workbook.create_sheet(title), 1, EXCEL_MAX_ROWS - 1
+                sheet.append(header)
+            for row in _excel_rows(chunk):
+                if not rows_left:
+                    part += 1
+                    sheet, rows_left = workbook.create_sheet(f"{title} ({part})"), EXCEL_MAX_ROWS - 1
+                    sheet.append(header)
+                sheet.append(row)
+                rows_left -= 1
+    workbook.save(target)
+
+
+def write_parquet(chunks, target):
+    """Menulis chunk ke satu file/buffer Parquet sebagai row group berurutan."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Export Parquet membutuhkan paket 'pyarrow'.") from e
+
+    writer = schema = None
+    try:
+        for chunk in _as_chunks(chunks):
+            if writer is None:
+                # Kolom yang kosong semua di chunk pertama dianggap teks agar chunk berikutnya cocok.
+                # Kategori disimpan sebagai teks biasa: Parquet membuat dictionary sendiri per
+                # row group yang hanya berisi nilai yang dipakai (bukan seluruh kategori).
+                inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+                schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type)
+                    else field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type)
+                    else field
+                    for field in inferred
+                ])
+                writer = pq.ParquetWriter(target, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+_WRITERS = {'csv': write_csv, 'parquet': write_parquet}
+
+
+# --- Export Bundel ---
+
+def export_tables(tables, output_dir, fmt='csv'):
+    """Menulis setiap tabel ke ``output_dir/<nama>.<fmt>``; mengembalikan daftar path."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt!r} (pilih {', '.join(EXPORT_FORMATS)}).")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, chunks in tables.items():
+        path = output_dir / f"{name}.{fmt}"
+        if fmt == 'xlsx':
+            write_excel({name: chunks}, path)
+        else:
+            _WRITERS[fmt](chunks, path)
+        paths.append(path)
+    return paths
+
+
+def export_file(tables, fmt='xlsx'):
+    """File sementara (posisi 0) berisi semua tabel: satu workbook untuk ``xlsx``, zip per tabel untuk lainnya.
+
+    Isi dibangun di disk sehingga memori tetap terbatas; cocok untuk ``st.download_button``.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt!r} (pilih {', '.join(EXPORT_FORMATS)}).")
+    target = tempfile.TemporaryFile()
+    if fmt == 'xlsx':
+        write_excel(tables, target)
+    else:
+        with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED if fmt == 'csv' else zipfile.ZIP_STORED) as archive:
+            for name, chunks in tables.items():
+                with archive.open(f"{name}.{fmt}", 'w', force_zip64=True) as member:
+                    if fmt == 'csv':
+                        text = io.TextIOWrapper(member, encoding='utf-8', newline='')
+                        write_csv(chunks, text)
+                        text.flush()
+                        text.detach()
+                    else:
+                        write_parquet(chunks, member)
+    target.seek(0)
+    return target
+
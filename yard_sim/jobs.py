@@ -0,0 +1,158 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+STATUS_LABELS = {
+    QUEUED: 'Menunggu antrian', RUNNING: 'Berjalan', DONE: 'Selesai', FAILED: 'Gagal', CANCELLED: 'Dibatalkan',
+}
+
+
+class JobCancelled(Exception):
+    """Dilempar dari callback progress ketika job dibatalkan."""
+
+
+class JobLimitError(RuntimeError):
+    """Pemilik sudah mencapai batas job aktif."""
+
+
+class SimulationJob:
+    """Satu simulasi yang dijalankan di worker pool.
+
+    ``progress`` berisi ``(hari, jumlah_hari)`` terakhir yang dilaporkan
+    ``run_simulation``; ``result`` terisi setelah status ``done`` dan ``error``
+    setelah ``failed``. Atribut diubah oleh thread worker; baca saja dari UI.
+    """
+
+    def __init__(self, job_id, owner, label=''):
+        self.id = job_id
+        self.owner = owner
+        self.label = label
+        self.status = QUEUED
+        self.progress = (0, 0)
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    @property
+    def fraction(self):
+        """Porsi hari yang sudah disimulasikan (0..1)."""
+        if self.status == DONE:
+            return 1.0
+        day, num_days = self.progress
+        return day / num_days if num_days else 0.0
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self):
+        """Meminta pembatalan; job di antrian batal langsung, job berjalan berhenti di awal hari berikutnya."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self.status = CANCELLED
+            self.finished_at = time.time()
+
+    def report(self, day, num_days):
+        """Callback ``progress`` untuk ``run_simulation``."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+        self.progress = (day, num_days)
+
+
+class JobManager:
+    """Worker pool terbatas untuk simulasi latar belakang, dipakai bersama oleh semua sesi.
+
+    Paling banyak ``max_workers`` simulasi berjalan bersamaan; sisanya antre.
+    Setiap ``owner`` (mis. id sesi Streamlit) boleh punya paling banyak
+    ``max_jobs_per_owner`` job yang belum selesai. Job yang sudah selesai
+    disimpan (maks. ``max_finished`` terbaru) sampai hasilnya diambil.
+
+    Worker berupa thread sehingga hasil, ``SimulationCheckpoints`` dan
+    ``Profiler`` milik sesi bisa dipakai langsung tanpa pickling.
+    """
+
+    def __init__(self, max_workers=2, max_jobs_per_owner=1, max_finished=32):
+        self.max_workers = max_workers
+        self.max_jobs_per_owner = max_jobs_per_owner
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yard-sim-job')
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, owner, func, *args, label='', **kwargs):
+        """Menjadwalkan ``func(*args, progress=job.report, **kwargs)``; melempar ``JobLimitError`` jika penuh."""
+        with self._lock:
+            if len(self.active(owner)) >= self.max_jobs_per_owner:
+                raise JobLimitError(
+                    f"Maksimal {self.max_jobs_per_owner} simulasi berjalan per pengguna. "
+                    "Tunggu atau batalkan simulasi sebelumnya."
+                )
+            job = SimulationJob(next(self._ids), owner, label)
+            self._jobs[job.id] = job
+            self._prune()
+            job._future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job._cancel.is_set():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = func(*args, progress=job.report, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        return [job for job in list(self._jobs.values()) if owner is None or job.owner == owner]
+
+    def active(self, owner=None):
+        return [job for job in self.jobs(owner) if not job.finished]
+
+    def discard(self, job_id):
+        """Melupakan job yang sudah selesai (mis. setelah hasilnya diambil)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def _prune(self):
+        finished = [job.id for job in self._jobs.values() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.active():
+                job.cancel()
+        self._executor.shutdown(wait=True)
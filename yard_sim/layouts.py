@@ -0,0 +1,127 @@
+"""Layout yard per terminal (area, jumlah slot per area, kapasitas slot) dari file."""
+
+import io
+import json
+import os
+
+import pandas as pd
+
+from .simulation import DEFAULT_SLOT_CAPACITY, DEFAULT_YARD_CONFIG
+
+DEFAULT_TERMINAL = 'Default'
+LAYOUT_REQUIRED_COLUMNS = ['TERMINAL', 'AREA', 'SLOTS']
+LAYOUT_FORMATS = {'.json': 'json', '.csv': 'csv', '.xlsx': 'excel', '.xls': 'excel'}
+
+
+class YardLayout:
+    """Layout satu terminal: ``yard_config`` (``{area: jumlah slot}``, urutan area dipertahankan) dan ``slot_capacity``."""
+
+    def __init__(self, name, yard_config, slot_capacity=DEFAULT_SLOT_CAPACITY):
+        self.name = str(name)
+        self.yard_config = {str(area): _positive_int(slots, f"jumlah slot area '{area}' di terminal '{name}'")
+                            for area, slots in dict(yard_config).items()}
+        if not self.yard_config:
+            raise ValueError(f"Terminal '{name}' tidak memiliki area.")
+        self.slot_capacity = _positive_int(slot_capacity, f"kapasitas slot terminal '{name}'")
+
+    @property
+    def total_slots(self):
+        return sum(self.yard_config.values())
+
+    @property
+    def capacity_boxes(self):
+        """Kapasitas yard dalam box (slot x kapasitas slot)."""
+        return self.total_slots * self.slot_capacity
+
+    def to_dict(self):
+        return {'slot_capacity': self.slot_capacity, 'areas': dict(self.yard_config)}
+
+    def __eq__(self, other):
+        return isinstance(other, YardLayout) and (self.name, self.yard_config, self.slot_capacity) == (
+            other.name, other.yard_config, other.slot_capacity
+        )
+
+    def __repr__(self):
+        return (f"YardLayout({self.name!r}, {len(self.yard_config)} area, {self.total_slots} slot, "
+                f"kapasitas {self.slot_capacity})")
+
+
+def _positive_int(value, label):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = float('nan')
+    if not number.is_integer() or number <= 0:
+        raise ValueError(f"Nilai {label} harus bilangan bulat positif, bukan {value!r}.")
+    return int(number)
+
+
+def default_layout():
+    """Layout terminal bawaan (``DEFAULT_YARD_CONFIG`` / ``DEFAULT_SLOT_CAPACITY``)."""
+    return YardLayout(DEFAULT_TERMINAL, DEFAULT_YARD_CONFIG, DEFAULT_SLOT_CAPACITY)
+
+
+def layouts_from_dict(data):
+    """``{terminal: YardLayout}`` dari dict JSON.
+
+    Format: ``{"T1": {"slot_capacity": 30, "areas": {"A01": 37, ...}}, ...}``,
+    boleh dibungkus ``{"terminals": {...}}``; ``slot_capacity`` opsional.
+    """
+    terminals = data.get('terminals', data) if isinstance(data, dict) else None
+    if not isinstance(terminals, dict) or not terminals:
+        raise ValueError("File layout harus berisi objek terminal, mis. {\"T1\": {\"areas\": {\"A01\": 37}}}.")
+    layouts = {}
+    for name, spec in terminals.items():
+        if not isinstance(spec, dict) or not isinstance(spec.get('areas'), dict):
+            raise ValueError(f"Terminal '{name}' harus memiliki objek 'areas' berisi {{area: jumlah slot}}.")
+        layouts[str(name)] = YardLayout(name, spec['areas'], spec.get('slot_capacity', DEFAULT_SLOT_CAPACITY))
+    return layouts
+
+
+def layouts_from_frame(df_layout):
+    """``{terminal: YardLayout}`` dari tabel kolom TERMINAL, AREA, SLOTS (dan opsional SLOT CAPACITY)."""
+    missing = [col for col in LAYOUT_REQUIRED_COLUMNS if col not in df_layout.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan di file layout: {', '.join(missing)}")
+    df_layout = df_layout.dropna(subset=LAYOUT_REQUIRED_COLUMNS)
+    if df_layout.empty:
+        raise ValueError("File layout tidak berisi baris area.")
+    layouts = {}
+    for name, rows in df_layout.groupby(df_layout['TERMINAL'].astype(str).str.strip(), sort=False):
+        areas = rows['AREA'].astype(str).str.strip()
+        duplicated = sorted(set(areas[areas.duplicated()]))
+        if duplicated:
+            raise ValueError(f"Area ganda di terminal '{name}': {', '.join(duplicated)}")
+        capacities = rows['SLOT CAPACITY'].dropna().unique() if 'SLOT CAPACITY' in rows else []
+        if len(capacities) > 1:
+            raise ValueError(f"Kapasitas slot terminal '{name}' harus sama untuk semua area.")
+        slot_capacity = capacities[0] if len(capacities) else DEFAULT_SLOT_CAPACITY
+        layouts[name] = YardLayout(name, dict(zip(areas, rows['SLOTS'])), slot_capacity)
+    return layouts
+
+
+def layout_format(name):
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in LAYOUT_FORMATS:
+        raise ValueError(f"Format file layout tidak dikenal: '{ext or name}'. Gunakan .json, .csv, atau .xlsx.")
+    return LAYOUT_FORMATS[ext]
+
+
+def read_layouts(source, file_format=None):
+    """Membaca layout terminal dari file .json, .csv, atau .xlsx (format ditebak dari nama file)."""
+    if file_format is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None)
+        file_format = layout_format(name) if name else 'json'
+    if file_format == 'json':
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, encoding='utf-8') as f:
+                return layouts_from_dict(json.load(f))
+        return layouts_from_dict(json.load(source))
+    if file_format == 'csv':
+        return layouts_from_frame(pd.read_csv(source))
+    return layouts_from_frame(pd.read_excel(source))
+
+
+def read_layouts_bytes(data, name):
+    """Membaca layout dari isi file (mis. hasil upload) dengan format dari ``name``."""
+    return read_layouts(io.BytesIO(data), layout_format(name))
@@ -0,0 +1,100 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .parallel import map_parallel
+from .simulation import run_simulation
+
+
+def _run_replication(shared, seed):
+    """Menjalankan satu replikasi dan meringkasnya menjadi tabel kecil per kapal dan per hari."""
+    args, layout = shared
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df_yor, df_recap, _, df_daily_log, _, vessels = run_simulation(*args, seed=seed, **layout)
+
+    cluster_counts = {name: sum(1 for c in v['clusters'] if c) for name, v in vessels.items()}
+    vessel_stats = df_recap[['Kapal', 'Box Gagal']].copy()
+    vessel_stats['Jumlah Cluster'] = vessel_stats['Kapal'].map(cluster_counts)
+
+    daily_failed = pd.Series(dtype=float)
+    if not df_daily_log.empty:
+        daily_failed = df_daily_log.groupby('Tanggal', observed=True)['Box Gagal Harian'].sum()
+        daily_failed.index = pd.to_datetime(daily_failed.index)
+    daily_stats = df_yor[['Tanggal', 'Rasio Okupansi (%)']].copy()
+    daily_stats['Box Gagal Harian'] = daily_stats['Tanggal'].map(daily_failed).fillna(0).astype(int)
+    return seed, vessel_stats, daily_stats
+
+
+def _distribution(df, by, columns, confidence):
+    """Statistik sebaran (mean, std, kuantil interval) per grup."""
+    lower_q = (1 - confidence) / 2
+    upper_q = 1 - lower_q
+    grouped = df.groupby(by)[columns]
+    summary = pd.concat({
+        'Rata-rata': grouped.mean(),
+        'Std': grouped.std(),
+        'Min': grouped.min(),
+        f'P{lower_q * 100:g}': grouped.quantile(lower_q),
+        'Median': grouped.median(),
+        f'P{upper_q * 100:g}': grouped.quantile(upper_q),
+        'Maks': grouped.max(),
+    }, axis=1)
+    return summary.swaplevel(axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+
+
+class MonteCarloResult:
+    """Hasil gabungan replikasi Monte Carlo beserta seed tiap replikasi."""
+
+    def __init__(self, args, seeds, vessel_stats, daily_stats, layout=None):
+        self._args = args
+        self._layout = layout or {}
+        self.seeds = seeds
+        self.vessel_stats = vessel_stats
+        self.daily_stats = daily_stats
+        per_replication = vessel_stats.groupby('Replikasi')['Box Gagal'].sum().rename('Total Box Gagal')
+        peak_yor = daily_stats.groupby('Replikasi')['Rasio Okupansi (%)'].max().rename('Puncak YOR (%)')
+        self.replications = pd.concat([per_replication, peak_yor], axis=1)
+        self.replications.insert(0, 'Seed', seeds)
+
+    def vessel_summary(self, confidence=0.9):
+        return _distribution(self.vessel_stats, 'Kapal', ['Box Gagal', 'Jumlah Cluster'], confidence)
+
+    def daily_summary(self, confidence=0.9):
+        return _distribution(self.daily_stats, 'Tanggal', ['Box Gagal Harian', 'Rasio Okupansi (%)'], confidence)
+
+    def replication_summary(self, confidence=0.9):
+        replications = self.replications.assign(Semua='Semua')
+        return _distribution(replications, 'Semua', ['Total Box Gagal', 'Puncak YOR (%)'], confidence)
+
+    def replay(self, replication):
+        """Mengulang persis satu replikasi (hasil lengkap ``run_simulation``) dari seed-nya."""
+        return run_simulation(*self._args, seed=self.seeds[replication], **self._layout)
+
+
+def replication_seeds(n_replications, base_seed=0):
+    """Seed independen per replikasi yang diturunkan dari satu ``base_seed``."""
+    return [int(s) for s in np.random.SeedSequence(base_seed).generate_state(n_replications)]
+
+
+def run_monte_carlo(df_schedule, df_trends, rules, rule_level, n_replications=100, base_seed=0, max_workers=None,
+                    yard_config=None, slot_capacity=None):
+    """Menjalankan ``n_replications`` simulasi ber-seed secara paralel di process pool.
+
+    ``max_workers`` default ke jumlah core; ``max_workers=1`` menjalankan semua
+    replikasi di proses saat ini tanpa pool. ``yard_config``/``slot_capacity``
+    memilih layout yard seperti di ``run_simulation``.
+    """
+    args = (df_schedule, df_trends, rules, rule_level)
+    layout = {'yard_config': yard_config, 'slot_capacity': slot_capacity}
+    seeds = replication_seeds(n_replications, base_seed)
+    results = map_parallel(_run_replication, seeds, (args, layout), max_workers)
+
+    vessel_frames, daily_frames = [], []
+    for replication, (seed, vessel_stats, daily_stats) in enumerate(results):
+        vessel_frames.append(vessel_stats.assign(Replikasi=replication, Seed=seed))
+        daily_frames.append(daily_stats.assign(Replikasi=replication, Seed=seed))
+    return MonteCarloResult(
+        args, seeds, pd.concat(vessel_frames, ignore_index=True), pd.concat(daily_frames, ignore_index=True), layout
+    )
@@ -0,0 +1,40 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Argumen bersama (jadwal, tren, ...) yang dikirim sekali ke setiap worker lewat
+# initializer, sehingga tiap task hanya membawa parameter kecilnya sendiri.
+_SHARED_ARGS = None
+
+
+def _init_worker(shared_args):
+    global _SHARED_ARGS
+    _SHARED_ARGS = shared_args
+
+
+def _run_task(task):
+    func, item = task
+    return func(_SHARED_ARGS, item)
+
+
+def map_parallel(func, items, shared_args, max_workers=None):
+    """Menjalankan ``func(shared_args, item)`` untuk setiap item di process pool.
+
+    ``func`` harus fungsi level modul (dapat di-pickle). ``max_workers`` default
+    ke jumlah core; ``max_workers=1`` menjalankan semuanya di proses saat ini.
+    Urutan hasil mengikuti urutan ``items``.
+    """
+    items = list(items)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(items))
+    if max_workers <= 1:
+        return [func(shared_args, item) for item in items]
+
+    # 'spawn' aman dipakai dari server Streamlit yang multi-thread.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(shared_args,),
+    ) as pool:
+        chunksize = max(1, len(items) // (max_workers * 4))
+        return list(pool.map(_run_task, [(func, item) for item in items], chunksize=chunksize))
@@ -0,0 +1,185 @@
+"""Kandidat penempatan blok slot untuk satu kapal, dinilai sekaligus dalam satu langkah vektor.
+
+Setiap alokasi harian membangun semua kandidat (perluasan depan/belakang setiap
+cluster dan blok baru dari run kosong) sebagai array paralel, menerapkan
+batasan slot kosong, zona blokir dan jarak internal kapal, lalu memilih
+kandidat layak dengan skor terendah. Fungsi skor dipilih lewat
+``rules['placement_score']`` (lihat ``PLACEMENT_SCORES``).
+"""
+
+import numpy as np
+
+from .engine import subtract_intervals
+
+DEFAULT_PLACEMENT_SCORE = 'best_fit'
+
+
+def _cluster_distance(start, slots_needed, cluster_first, cluster_last):
+    """Jarak (slot di antaranya) blok ``[start, start + slots_needed)`` ke setiap cluster, shape ``(blok, cluster)``."""
+    end = start + slots_needed - 1
+    return np.maximum(cluster_first[None, :] - end[:, None], start[:, None] - cluster_last[None, :]) - 1
+
+
+class PlacementCandidates:
+    """Kandidat penempatan ``slots_needed`` slot sebagai array paralel (satu elemen per kandidat).
+
+    ``num_expansions`` kandidat pertama adalah perluasan cluster, berurutan per
+    cluster (depan lalu belakang, lihat ``expansion``) dengan mask ``expand_fits``;
+    sisanya blok baru dari run placeable: ``block_starts`` (indeks global slot
+    pertama), ``block_lengths`` (panjang run), ``block_areas`` dan
+    ``block_feasible`` (muat dan memenuhi jarak internal kapal). ``feasible``
+    menggabungkan kedua mask dalam urutan kandidat.
+
+    ``cluster_idx``/``cluster_first``/``cluster_last``/``cluster_area`` adalah
+    indeks dan batas cluster kapal yang tidak kosong, untuk dipakai fungsi skor.
+    """
+
+    def __init__(self, slots_needed, total_slots, cluster_bounds, expand_fits, block_starts, block_lengths,
+                 block_areas, block_feasible):
+        self.slots_needed = slots_needed
+        self.total_slots = total_slots
+        self.cluster_idx, self.cluster_first, self.cluster_last, self.cluster_area = cluster_bounds.T
+        self.num_expansions = 2 * len(self.cluster_idx)
+        self.expand_fits = expand_fits
+        self.block_starts = block_starts
+        self.block_lengths = block_lengths
+        self.block_areas = block_areas
+        self.block_feasible = block_feasible
+
+    def __len__(self):
+        return self.num_expansions + len(self.block_starts)
+
+    @property
+    def feasible(self):
+        return np.concatenate((self.expand_fits, self.block_feasible))
+
+    def expansion(self, i):
+        """``(indeks cluster, slot awal, sebelum_cluster)`` untuk kandidat perluasan ke-``i``."""
+        j, before = i // 2, i % 2 == 0
+        start = self.cluster_first[j] - self.slots_needed if before else self.cluster_last[j] + 1
+        return int(self.cluster_idx[j]), int(start), before
+
+    def cluster_distance(self, start):
+        """Jarak blok berawal di ``start`` ke setiap cluster kapal, shape ``(blok, cluster)``."""
+        return _cluster_distance(start, self.slots_needed, self.cluster_first, self.cluster_last)
+
+
+def placement_candidates(ship, slots_needed, yard, cut_starts, cut_ends, rules, expansions_first=False):
+    """Semua kandidat penempatan ``slots_needed`` slot untuk ``ship`` dengan mask kelayakannya.
+
+    ``cut_starts``/``cut_ends`` adalah interval yang terblokir kapal lain
+    (``BlockingIndex.blocked_intervals``). Perluasan hanya butuh slot kosong di
+    luar zona blokir; blok baru juga harus berjarak minimal
+    ``rules['intra_ship_gap']`` dari cluster kapal di area yang sama.
+
+    Dengan ``expansions_first`` (lihat ``select_placement``), blok baru hanya
+    dienumerasi jika tidak ada perluasan yang layak.
+    """
+    # Cluster selalu terurut menurut indeks global (diisi sebagai blok terurut di depan/belakang).
+    area_offset, area_index = yard.area_offset, yard.area_index
+    cluster_bounds = np.array([
+        (i, area_offset[cluster[0][0]] + cluster[0][1] - 1, area_offset[cluster[-1][0]] + cluster[-1][1] - 1,
+         area_index[cluster[0][0]])
+        for i, cluster in enumerate(ship['clusters']) if cluster
+    ], dtype=np.int64).reshape(-1, 4)
+    cluster_first, cluster_last, cluster_area = cluster_bounds[:, 1], cluster_bounds[:, 2], cluster_bounds[:, 3]
+
+    # --- Perluasan: [first - n, first) / [last + 1, last + 1 + n) harus di dalam yard, kosong, tidak terblokir ---
+    expand_fits = np.zeros(2 * len(cluster_bounds), dtype=bool)
+    if len(cluster_bounds):
+        expand_start = np.empty(len(expand_fits), dtype=np.int64)
+        expand_start[0::2] = cluster_first - slots_needed
+        expand_start[1::2] = cluster_last + 1
+        expand_fits = (expand_start >= 0) & (expand_start <= yard.total_slots - slots_needed)
+        lo = expand_start[expand_fits]
+        expand_fits[expand_fits] = ~(
+            yard.owner[lo[:, None] + np.arange(slots_needed)].any(axis=1)
+            | ((cut_starts < (lo + slots_needed)[:, None]) & (cut_ends > lo[:, None])).any(axis=1)
+        )
+
+    # --- Blok baru: run placeable dari run kosong yang minimal sepanjang kebutuhan ---
+    if expansions_first and expand_fits.any():
+        block_starts = block_ends = np.empty(0, dtype=np.int64)
+    else:
+        long_runs = yard.free_runs.lengths() >= slots_needed
+        block_starts, block_ends = subtract_intervals(
+            yard.free_runs.starts[long_runs], yard.free_runs.ends[long_runs], cut_starts, cut_ends
+        )
+    block_lengths = block_ends - block_starts
+    block_areas = yard.slot_area[block_starts]
+    block_feasible = block_lengths >= slots_needed
+    if len(cluster_first) and len(block_starts):
+        block_feasible &= ~(
+            (block_areas[:, None] == cluster_area)
+            & (_cluster_distance(block_starts, slots_needed, cluster_first, cluster_last) < rules['intra_ship_gap'])
+        ).any(axis=1)
+
+    return PlacementCandidates(slots_needed, yard.total_slots, cluster_bounds, expand_fits,
+                               block_starts, block_lengths, block_areas, block_feasible)
+
+
+# --- Fungsi Skor (lebih kecil = lebih baik) ---
+
+def _expansions_first(candidates, new_block_score):
+    """Perluasan mendapat skor negatif sesuai urutannya sehingga selalu menang atas blok baru."""
+    num_expansions = candidates.num_expansions
+    return np.concatenate((np.arange(num_expansions, dtype=np.int64) - num_expansions, new_block_score))
+
+
+def score_best_fit(candidates):
+    """Perluas cluster pertama yang bisa; jika tidak, blok baru dari run placeable terkecil (best-fit)."""
+    return _expansions_first(candidates, candidates.block_lengths)
+
+
+def score_nearest(candidates):
+    """Perluas cluster pertama yang bisa; jika tidak, blok baru terdekat ke cluster kapal di area yang sama.
+
+    Kandidat di area tanpa cluster kapal dianggap berjarak ``total_slots``; seri dipecah dengan best-fit.
+    """
+    distance = np.where(
+        candidates.block_areas[:, None] == candidates.cluster_area[None, :],
+        candidates.cluster_distance(candidates.block_starts), candidates.total_slots,
+    )
+    nearest = distance.min(axis=1, initial=candidates.total_slots)
+    return _expansions_first(candidates, nearest * (candidates.total_slots + 1) + candidates.block_lengths)
+
+
+# Skor bawaan selalu memilih perluasan layak pertama (urutan cluster) di atas blok baru mana pun.
+score_best_fit.expansions_first = True
+score_nearest.expansions_first = True
+
+PLACEMENT_SCORES = {
+    'best_fit': score_best_fit,
+    'nearest': score_nearest,
+}
+PLACEMENT_SCORE_LABELS = {
+    'best_fit': 'Best-fit (run terkecil)',
+    'nearest': 'Terdekat ke cluster kapal',
+}
+
+
+def placement_scorer(name=None):
+    """Fungsi skor terdaftar di ``PLACEMENT_SCORES`` (default ``DEFAULT_PLACEMENT_SCORE``)."""
+    name = name or DEFAULT_PLACEMENT_SCORE
+    if name not in PLACEMENT_SCORES:
+        raise ValueError(f"Fungsi skor penempatan tidak dikenal: {name!r} (pilih {', '.join(PLACEMENT_SCORES)}).")
+    return PLACEMENT_SCORES[name]
+
+
+def select_placement(candidates, score, rng):
+    """Indeks kandidat layak dengan skor terendah, atau ``None``.
+
+    Kandidat seri diacak dengan ``rng.shuffle`` agar penempatan menyebar
+    (satu kandidat tidak memakai angka acak). Fungsi skor dengan atribut
+    ``expansions_first = True`` menyatakan perluasan layak pertama (urutan
+    cluster) selalu menang, sehingga skor hanya dihitung jika tidak ada.
+    """
+    if getattr(score, 'expansions_first', False) and candidates.expand_fits.any():
+        return int(candidates.expand_fits.argmax())
+    scores = np.where(candidates.feasible, score(candidates), np.inf)
+    best_score = scores.min(initial=np.inf)
+    if best_score == np.inf:
+        return None
+    best = np.flatnonzero(scores == best_score).tolist()
+    rng.shuffle(best)
+    return best[0]
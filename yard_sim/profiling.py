@@ -0,0 +1,159 @@
+"""Instrumentasi ringan untuk hot path simulasi (waktu per fase, per hari, dan counter)."""
+
+import json
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+import pandas as pd
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullProfiler:
+    """Profiler non-aktif: semua method no-op sehingga overhead hot path minimal."""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_CONTEXT
+
+    def add_time(self, name, seconds, calls=1):
+        pass
+
+    def start_day(self, day):
+        pass
+
+    def count(self, name, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _PhaseTimer:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler(NullProfiler):
+    """Merekam waktu dinding & jumlah panggilan per fase (total dan per hari simulasi),
+    counter (mis. alasan gagal alokasi), serta observasi numerik (jumlah, min, maks).
+
+    Dipakai dengan ``run_simulation(..., profiler=Profiler())``; fase yang sama
+    boleh bersarang (mis. ``block_selection`` di dalam ``allocate``), sehingga
+    persentase fase tidak dijumlahkan menjadi 100%.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.phases = defaultdict(lambda: [0.0, 0])
+        self.daily = defaultdict(lambda: [0.0, 0])
+        self.counters = defaultdict(int)
+        self.observations = {}
+        self.day = None
+
+    def phase(self, name):
+        return _PhaseTimer(self, name)
+
+    def add_time(self, name, seconds, calls=1):
+        entry = self.phases[name]
+        entry[0] += seconds
+        entry[1] += calls
+        if self.day is not None:
+            entry = self.daily[(self.day, name)]
+            entry[0] += seconds
+            entry[1] += calls
+
+    def set_time(self, name, seconds):
+        """Mengganti total fase (mis. ``render`` yang diukur ulang setiap rerun UI)."""
+        self.phases[name] = [seconds, 1]
+
+    def start_day(self, day):
+        """Fase berikutnya juga dicatat pada hari ``day``; ``None`` untuk di luar loop harian."""
+        self.day = day
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def observe(self, name, value):
+        stats = self.observations.get(name)
+        if stats is None:
+            self.observations[name] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+        else:
+            stats['count'] += 1
+            stats['sum'] += value
+            stats['min'] = min(stats['min'], value)
+            stats['max'] = max(stats['max'], value)
+
+    # --- Ringkasan & Ekspor ---
+
+    def phase_frame(self, total=None):
+        """Tabel per fase; ``total`` (detik) dipakai untuk kolom persen (default: fase ``run``)."""
+        total = total or self.phases.get('run', [0.0])[0]
+        rows = [{
+            'Fase': name, 'Waktu (s)': seconds, 'Panggilan': calls,
+            'Rata-rata (ms)': seconds / calls * 1000 if calls else 0.0,
+            'Persen (%)': seconds / total * 100 if total else None,
+        } for name, (seconds, calls) in self.phases.items()]
+        df = pd.DataFrame(rows, columns=['Fase', 'Waktu (s)', 'Panggilan', 'Rata-rata (ms)', 'Persen (%)'])
+        return df.sort_values('Waktu (s)', ascending=False, ignore_index=True)
+
+    def daily_frame(self, dates=None):
+        """Waktu (s) per hari simulasi x fase; index tanggal jika ``dates`` diberikan."""
+        if not self.daily:
+            return pd.DataFrame()
+        series = pd.Series({key: seconds for key, (seconds, _) in self.daily.items()})
+        df = series.unstack(fill_value=0.0).sort_index()
+        if dates is not None:
+            df.index = pd.DatetimeIndex(dates)[df.index]
+        df.index.name = 'Tanggal' if dates is not None else 'Hari'
+        return df
+
+    def counter_frame(self):
+        rows = [{'Counter': name, 'Jumlah': value, 'Min': None, 'Maks': None, 'Rata-rata': None}
+                for name, value in sorted(self.counters.items())]
+        rows += [{'Counter': name, 'Jumlah': stats['count'], 'Min': stats['min'], 'Maks': stats['max'],
+                  'Rata-rata': stats['sum'] / stats['count']}
+                 for name, stats in sorted(self.observations.items())]
+        return pd.DataFrame(rows, columns=['Counter', 'Jumlah', 'Min', 'Maks', 'Rata-rata'])
+
+    def to_dict(self):
+        return {
+            'phases': {name: {'seconds': seconds, 'calls': calls} for name, (seconds, calls) in self.phases.items()},
+            'daily': [{'day': day, 'phase': name, 'seconds': seconds, 'calls': calls}
+                      for (day, name), (seconds, calls) in sorted(self.daily.items())],
+            'counters': dict(self.counters),
+            'observations': self.observations,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, default=float)
+
+    def to_csv(self):
+        """Semua metrik dalam satu CSV format panjang (``section,name,day,metric,value``)."""
+        rows = []
+        for name, (seconds, calls) in self.phases.items():
+            rows += [('phase', name, None, 'seconds', seconds), ('phase', name, None, 'calls', calls)]
+        for (day, name), (seconds, calls) in sorted(self.daily.items()):
+            rows += [('daily', name, day, 'seconds', seconds), ('daily', name, day, 'calls', calls)]
+        rows += [('counter', name, None, 'count', value) for name, value in sorted(self.counters.items())]
+        for name, stats in sorted(self.observations.items()):
+            rows += [('observation', name, None, metric, value) for metric, value in stats.items()]
+        df = pd.DataFrame(rows, columns=['section', 'name', 'day', 'metric', 'value'])
+        df['day'] = df['day'].astype('Int64')
+        return df.to_csv(index=False)
@@ -0,0 +1,69 @@
+import hashlib
+import importlib.util
+import io
+import os
+
+import pandas as pd
+
+SCHEDULE_DATE_COLUMNS = ['OPEN STACKING', 'ETA', 'ETD']
+SCHEDULE_REQUIRED_COLUMNS = ['VESSEL', 'SERVICE', 'TOTAL BOX (TEUS)'] + SCHEDULE_DATE_COLUMNS
+SCHEDULE_FORMATS = {'.xlsx': 'excel', '.xls': 'excel', '.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet'}
+
+# Parser CSV pyarrow jauh lebih cepat untuk jadwal besar; dipakai hanya jika terpasang.
+_CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+
+def schedule_format(name):
+    """Format file jadwal (``excel``/``csv``/``parquet``) dari ekstensi nama file."""
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in SCHEDULE_FORMATS:
+        raise ValueError(f"Format file jadwal tidak dikenal: '{ext or name}'. Gunakan .xlsx, .csv, atau .parquet.")
+    return SCHEDULE_FORMATS[ext]
+
+
+def schedule_digest(data):
+    """Hash sha256 dari isi (bytes) file jadwal, dipakai sebagai kunci cache."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_schedule(df_schedule):
+    """Pastikan kolom wajib Vessel Schedule tersedia."""
+    missing = [col for col in SCHEDULE_REQUIRED_COLUMNS if col not in df_schedule.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan di file jadwal: {', '.join(missing)}")
+
+
+def normalize_schedule(df_schedule):
+    """Konversi kolom tanggal & TEUS dan buang baris dengan tanggal tidak valid."""
+    validate_schedule(df_schedule)
+    df_schedule = df_schedule.copy()
+    for col in SCHEDULE_DATE_COLUMNS:
+        df_schedule[col] = pd.to_datetime(df_schedule[col], dayfirst=True, errors='coerce')
+    df_schedule['TOTAL BOX (TEUS)'] = pd.to_numeric(df_schedule['TOTAL BOX (TEUS)'], errors='coerce').fillna(0).astype(int)
+    df_schedule.dropna(subset=SCHEDULE_DATE_COLUMNS, inplace=True)
+    return df_schedule
+
+
+def _read_raw_schedule(source, file_format):
+    if file_format == 'csv':
+        return pd.read_csv(source, engine=_CSV_ENGINE)
+    if file_format == 'parquet':
+        return pd.read_parquet(source)
+    return pd.read_excel(source)
+
+
+def read_schedule(source, file_format=None):
+    """Membaca file Vessel Schedule (.xlsx, .csv, atau .parquet) dan menormalkannya.
+
+    Format ditebak dari nama file (atau atribut ``name`` objek file) jika
+    ``file_format`` tidak diberikan; sumber tanpa nama dianggap Excel.
+    """
+    if file_format is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None)
+        file_format = schedule_format(name) if name else 'excel'
+    return normalize_schedule(_read_raw_schedule(source, file_format))
+
+
+def read_schedule_bytes(data, name):
+    """Membaca jadwal dari isi file (mis. hasil upload) dengan format dari ``name``."""
+    return read_schedule(io.BytesIO(data), schedule_format(name))
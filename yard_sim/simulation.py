@@ -0,0 +1,353 @@
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from .aggregation import DailyLogBuffer, build_allocation_map, build_recap
+from .blocking import BlockingIndex
+from .engine import YardState, subtract_intervals
+from .events import DEPARTURE, OPEN_STACKING, OPERATIONAL_START, build_vessel_events
+from .placement import DEFAULT_PLACEMENT_SCORE, placement_candidates, placement_scorer, select_placement
+from .profiling import NULL_PROFILER
+from .snapshots import YardSnapshots
+from .trends import as_trend_matrix
+
+# --- Konfigurasi Default Aplikasi ---
+DEFAULT_YARD_CONFIG = {
+    'A01': 37, 'A02': 37, 'A03': 37, 'A04': 37,
+    'B01': 37, 'B02': 37, 'B03': 37, 'B04': 37, 'B05': 37,
+    'C03': 45, 'C04': 45, 'C05': 45
+}
+DEFAULT_SLOT_CAPACITY = 30
+
+# --- Hierarki Aturan ---
+RULE_LEVELS = ["Level 1: Optimal", "Level 2: Aman & Terfragmentasi", "Level 3: Darurat (Approval)"]
+EMERGENCY_RULE_LEVEL = RULE_LEVELS[2]
+DEFAULT_RULE_VALUES = {'intra_ship_gap': 5, 'daily_exclusion_zone': 7, 'inter_ship_gap': 10}
+EMERGENCY_RULE_VALUES = {'intra_ship_gap': 2, 'daily_exclusion_zone': 3, 'inter_ship_gap': 5}
+
+
+def build_rules(rule_level, intra_ship_gap=None, daily_exclusion_zone=None, inter_ship_gap=None, ignored_vessels=(),
+                placement_score=None):
+    """Menyusun dict ``sim_rules`` untuk level aturan; nilai ``None`` memakai default level.
+
+    ``placement_score`` memilih fungsi skor kandidat blok (lihat :mod:`yard_sim.placement`).
+    """
+    is_emergency = rule_level == EMERGENCY_RULE_LEVEL
+    rules = dict(EMERGENCY_RULE_VALUES if is_emergency else DEFAULT_RULE_VALUES)
+    overrides = {
+        'intra_ship_gap': intra_ship_gap,
+        'daily_exclusion_zone': daily_exclusion_zone,
+        'inter_ship_gap': inter_ship_gap,
+    }
+    rules.update({key: value for key, value in overrides.items() if value is not None})
+    rules['cluster_req_logic'] = 'Agresif' if is_emergency else 'Wajar'
+    rules['ignored_vessels'] = list(ignored_vessels)
+    rules['placement_score'] = placement_score or DEFAULT_PLACEMENT_SCORE
+    return rules
+
+# --- Fungsi Perhitungan Kedatangan ---
+
+def get_daily_arrivals(total_boxes, service_name, trends, num_days):
+    """Menghitung jumlah box harian, menangani kekurangan hari dengan nilai 0."""
+    return as_trend_matrix(trends).daily_arrivals([total_boxes], [service_name], [num_days])[0]
+
+# --- Fungsi Inti Simulasi ("Otak" Aplikasi) ---
+
+def run_simulation(df_schedule, df_trends, rules, rule_level, seed=None, yard_config=None, slot_capacity=None,
+                   profiler=None, checkpoints=None, progress=None):
+    """Fungsi utama untuk menjalankan seluruh proses simulasi dengan logika nyata.
+
+    ``df_trends`` boleh berupa ``TrendMatrix`` atau DataFrame stacking trend.
+    ``seed`` mengunci generator acak pemilihan blok best-fit sehingga hasil
+    simulasi dapat diulang persis; ``None`` memakai seed acak seperti sebelumnya.
+    ``yard_config`` (``{area: jumlah slot}``) dan ``slot_capacity`` default ke
+    layout terminal bawaan. ``profiler`` (lihat :class:`yard_sim.profiling.Profiler`)
+    merekam waktu per fase & per hari serta counter alokasi; ``None`` = non-aktif.
+    ``checkpoints`` (lihat :class:`yard_sim.checkpoints.SimulationCheckpoints`)
+    menyimpan checkpoint berkala; jika berisi run sebelumnya yang kompatibel,
+    simulasi dilanjutkan dari checkpoint sebelum hari pertama yang terdampak.
+    ``progress(hari, jumlah_hari)`` dipanggil di awal setiap hari simulasi;
+    exception dari callback (mis. pembatalan job) menghentikan simulasi.
+    """
+    profiler = profiler or NULL_PROFILER
+    run_start = time.perf_counter()
+
+    # --- BAGIAN 1: INISIALISASI ---
+    yard = YardState(yard_config or DEFAULT_YARD_CONFIG, slot_capacity or DEFAULT_SLOT_CAPACITY)
+    trends = as_trend_matrix(df_trends)
+    vessels = setup_vessels(df_schedule, trends, rules, yard, profiler)
+
+    start_date_sim = df_schedule['OPEN STACKING'].min().normalize()
+    end_date_sim = df_schedule['ETD'].max().normalize()
+    date_range = pd.date_range(start=start_date_sim, end=end_date_sim, freq='D')
+
+    blocking = BlockingIndex(yard, rules)
+    rng = random.Random(seed)
+    daily_log = DailyLogBuffer()
+    daily_yard_snapshots = YardSnapshots(yard)
+    occupied_per_day = np.zeros(len(date_range), dtype=np.int64)
+
+    # Kapal aktif dipelihara dari antrian event sehingga biaya per hari
+    # sebanding dengan jumlah kapal aktif, bukan seluruh jadwal.
+    events = build_vessel_events(vessels)
+    active_ships = {}
+    first_day = 0
+
+    if checkpoints is not None:
+        run_inputs = checkpoints.describe_inputs(vessels, yard, trends, rules, seed, date_range)
+        restored = checkpoints.restore(run_inputs, len(date_range))
+        if restored is not None:
+            first_day, state = restored
+            yard, blocking = state['yard'], state['blocking']
+            for name in run_inputs['vessel_names'][len(yard.vessel_names) - 1:]:
+                yard.register_vessel(name)
+            blocking.ignored_vessels = set(rules.get('ignored_vessels', []))
+            for ship in vessels.values():
+                if ship['vessel_id'] in state['vessels']:
+                    ship['clusters'], ship['remaining_capacity'] = state['vessels'][ship['vessel_id']]
+            vessels_by_id = {ship['vessel_id']: ship for ship in vessels.values()}
+            active_ships = {vessel_id: vessels_by_id[vessel_id] for vessel_id in state['active']}
+            rng.setstate(state['rng'])
+            if first_day:
+                # Event yang sudah diproses sebelum hari checkpoint dibuang.
+                for _ in events.pop_due(date_range[first_day - 1]):
+                    pass
+            daily_log = checkpoints.daily_log.head(state['log_rows'])
+            daily_yard_snapshots = checkpoints.snapshots.head(first_day, yard)
+            occupied_per_day[:first_day] = checkpoints.occupied_per_day[:first_day]
+        checkpoints.begin(run_inputs, first_day)
+
+    # --- BAGIAN 2: LOGIKA SIMULASI INTI ---
+    try:
+        simulate_days(
+            date_range, first_day, vessels, yard, blocking, rules, rng, events, active_ships,
+            daily_log, occupied_per_day, daily_yard_snapshots, profiler, checkpoints, progress
+        )
+    except BaseException:
+        # Checkpoint run yang terputus tidak cocok dengan log run sebelumnya.
+        if checkpoints is not None:
+            checkpoints.clear()
+        raise
+    if checkpoints is not None:
+        checkpoints.finish(daily_log, occupied_per_day, daily_yard_snapshots)
+
+    # --- BAGIAN 3: AGREGASI & PERSIAPAN OUTPUT ---
+    aggregation_start = time.perf_counter()
+    df_daily_log = daily_log.to_frame(date_range, yard.vessel_names)
+    df_yor = pd.DataFrame({
+        'Tanggal': date_range,
+        'Total Box di Yard': occupied_per_day * yard.slot_capacity,
+        'Rasio Okupansi (%)': occupied_per_day / yard.total_slots * 100
+    })
+    df_recap = build_recap(vessels, daily_log.failed_boxes_by_vessel(len(yard.vessel_names)))
+    df_map = build_allocation_map(vessels, yard)
+    profiler.add_time('aggregation', time.perf_counter() - aggregation_start)
+    profiler.add_time('run', time.perf_counter() - run_start)
+
+    return df_yor, df_recap, df_map, df_daily_log, daily_yard_snapshots, vessels
+
+
+def setup_vessels(df_schedule, trends, rules, yard, profiler=NULL_PROFILER):
+    """Membangun dict state kapal (``{nama: ship}``) dan mendaftarkan id-nya di ``yard``."""
+    # Kedatangan harian semua kapal dihitung sekaligus dari matriks tren.
+    with profiler.phase('daily_arrivals'):
+        num_days = (df_schedule['ETD'].dt.normalize() - df_schedule['OPEN STACKING'].dt.normalize()).dt.days
+        all_daily_arrivals = trends.daily_arrivals(
+            df_schedule['TOTAL BOX (TEUS)'].to_numpy(), df_schedule['SERVICE'].tolist(), (num_days + 1).to_numpy()
+        )
+
+    vessel_setup_start = time.perf_counter()
+    rows = df_schedule[['VESSEL', 'SERVICE', 'TOTAL BOX (TEUS)', 'ETA']].assign(**{
+        'OPEN STACKING': df_schedule['OPEN STACKING'].dt.normalize(), 'ETD': df_schedule['ETD'].dt.normalize()
+    }).to_dict('records')
+    vessels = {}
+    for row, daily_arrivals in zip(rows, all_daily_arrivals):
+        ship_name = row['VESSEL']
+        start_date = row['OPEN STACKING']
+        eta_date = row['ETA'] # Simpan ETA dengan waktu
+        etd_date = row['ETD']
+        
+        base_avg = 150 if rules['cluster_req_logic'] == 'Wajar' else 100
+        initial_cluster_req = max(1, int(np.ceil(row['TOTAL BOX (TEUS)'] / base_avg)))
+
+        vessels[ship_name] = {
+            'name': ship_name, 'service': row['SERVICE'], 'total_boxes': row['TOTAL BOX (TEUS)'],
+            'start_date': start_date, 'eta_date': eta_date, 'etd_date': etd_date,
+            'daily_arrivals': daily_arrivals,
+            'clusters': [[] for _ in range(initial_cluster_req)],
+            'max_clusters': initial_cluster_req + 2,
+            'remaining_capacity': 0,
+            'vessel_id': yard.register_vessel(ship_name)
+        }
+    profiler.add_time('vessel_setup', time.perf_counter() - vessel_setup_start)
+    return vessels
+
+
+def simulate_days(date_range, first_day, vessels, yard, blocking, rules, rng, events, active_ships,
+                  daily_log, occupied_per_day, daily_yard_snapshots, profiler=NULL_PROFILER, checkpoints=None,
+                  progress=None):
+    """Loop harian simulasi mulai hari ke-``first_day`` dari ``date_range`` (state dimutasi in place)."""
+    for day in range(first_day, len(date_range)):
+        current_date = date_range[day]
+        if progress is not None:
+            progress(day, len(date_range))
+        if checkpoints is not None and checkpoints.is_due(day):
+            with profiler.phase('checkpoint'):
+                checkpoints.save(day, yard, blocking, vessels, active_ships, rng, daily_log)
+        profiler.start_day(day)
+        day_start = time.perf_counter()
+        with profiler.phase('events'):
+            for kind, ship_data in events.pop_due(current_date):
+                if kind == DEPARTURE:
+                    active_ships.pop(ship_data['vessel_id'], None)
+                    blocking.deactivate(ship_data)
+                    slots_to_free = [yard.slot_index(slot) for cluster in ship_data['clusters'] for slot in cluster]
+                    yard.release(slots_to_free, ship_data['vessel_id'])
+                elif kind == OPEN_STACKING:
+                    active_ships[ship_data['vessel_id']] = ship_data
+                elif kind == OPERATIONAL_START:
+                    blocking.activate(ship_data)
+
+        # Urutan sama seperti sebelumnya: TEUS terbesar dulu, seri mengikuti urutan jadwal.
+        active_ships_today = sorted(active_ships.values(), key=lambda x: (-x['total_boxes'], x['vessel_id']))
+        
+        for ship in active_ships_today:
+            log_row = allocate_vessel_day(ship, current_date, yard, blocking, rules, rng, profiler)
+            daily_log.append(day, ship['vessel_id'], *log_row)
+        
+        occupied_per_day[day] = yard.occupied_count
+        with profiler.phase('snapshot'):
+            daily_yard_snapshots.record(current_date, yard.owner)
+        profiler.add_time('day', time.perf_counter() - day_start)
+    profiler.start_day(None)
+
+
+def allocate_vessel_day(ship, current_date, yard, blocking, rules, rng, profiler=NULL_PROFILER):
+    """Memproses kedatangan box satu kapal pada satu hari (state kapal, yard & blokir dimutasi).
+
+    Mengembalikan ``(butuh_box, butuh_slot, slot_berhasil, box_gagal, rekomendasi)`` untuk log harian.
+    """
+    slot_capacity = yard.slot_capacity
+    day_index = (current_date - ship['start_date']).days
+    boxes_to_allocate_today = 0
+    if day_index < len(ship['daily_arrivals']):
+        boxes_to_allocate_today = ship['daily_arrivals'][day_index]
+    
+    effective_boxes_needed = boxes_to_allocate_today - ship['remaining_capacity']
+    
+    slots_needed = 0
+    slots_allocated_today = []
+    recommendation = "Tidak ada aktivitas penumpukan"
+    boxes_failed_today = 0
+
+    if effective_boxes_needed > 0:
+        ship['remaining_capacity'] = 0
+        slots_needed = int(np.ceil(effective_boxes_needed / slot_capacity))
+        
+        with profiler.phase('allocate'):
+            slots_allocated_today, recommendation = allocate_slots_intelligently(
+                ship, slots_needed, yard, blocking, rules, rng, profiler=profiler
+            )
+        profiler.count(recommendation if not slots_allocated_today else 'Alokasi berhasil')
+        
+        newly_allocated_capacity = len(slots_allocated_today) * slot_capacity
+        ship['remaining_capacity'] = newly_allocated_capacity - effective_boxes_needed
+
+        slots_failed = slots_needed - len(slots_allocated_today)
+        if slots_failed > 0 and slots_needed > 0:
+            boxes_per_needed_slot = effective_boxes_needed / slots_needed
+            boxes_failed_today = int(np.round(slots_failed * boxes_per_needed_slot))
+
+    elif boxes_to_allocate_today > 0:
+        ship['remaining_capacity'] = abs(effective_boxes_needed)
+        recommendation = f"Menggunakan sisa kapasitas. Sisa: {ship['remaining_capacity']} box."
+
+    return boxes_to_allocate_today, slots_needed, len(slots_allocated_today), boxes_failed_today, recommendation
+
+def find_placeable_runs(current_ship, yard, blocking):
+    """Run slot kosong kontigu (``starts``, ``ends`` global, terurut) yang tidak terblokir kapal lain."""
+    cut_starts, cut_ends = blocking.blocked_intervals(current_ship)
+    return subtract_intervals(yard.free_runs.starts, yard.free_runs.ends, cut_starts, cut_ends)
+
+
+def find_placeable_slots(current_ship, yard, blocking):
+    """Mengembalikan indeks global (terurut) slot kosong yang tidak terblokir kapal lain."""
+    starts, ends = find_placeable_runs(current_ship, yard, blocking)
+    lengths = ends - starts
+    return np.repeat(starts - np.cumsum(np.concatenate(([0], lengths[:-1]))), lengths) + np.arange(lengths.sum())
+
+
+def allocate_slots_intelligently(ship, slots_needed, yard, blocking, rules, rng, profiler=NULL_PROFILER):
+    with profiler.phase('blocked_intervals'):
+        cut_starts, cut_ends = blocking.blocked_intervals(ship)
+    if profiler.enabled:
+        # Zona boleh tumpang tindih: hitung gabungannya, dan set placeable penuh sekali per alokasi.
+        profiler.observe('blocked_slots', int(blocking.blocked_mask(ship).sum()))
+        starts, ends = subtract_intervals(yard.free_runs.starts, yard.free_runs.ends, cut_starts, cut_ends)
+        profiler.observe('placeable_slots', int((ends - starts).sum()))
+
+    def not_enough_slots():
+        starts, ends = subtract_intervals(yard.free_runs.starts, yard.free_runs.ends, cut_starts, cut_ends)
+        return (ends - starts).sum() < slots_needed
+
+    if yard.free_runs.lengths().sum() < slots_needed:
+        return [], "Gagal: Tidak cukup slot valid yang tersedia (terblokir kapal lain)."
+
+    def format_slot_list_to_string(slot_list):
+        if not slot_list: return ""
+        start = slot_list[0]; end = slot_list[-1]
+        return f"{start[0]}:{start[1]}" if start == end else f"{start[0]}:{start[1]}-{end[1]}"
+
+    def fill(cluster_idx, start_idx, prepend=False):
+        slots_to_fill = yard.slots_at(range(start_idx, start_idx + slots_needed))
+        if prepend:
+            ship['clusters'][cluster_idx] = slots_to_fill + ship['clusters'][cluster_idx]
+        else:
+            ship['clusters'][cluster_idx].extend(slots_to_fill)
+        yard.allocate_range(start_idx, start_idx + slots_needed, ship['vessel_id'])
+        blocking.update_cluster(ship, cluster_idx)
+        return slots_to_fill
+
+    score = placement_scorer(rules.get('placement_score'))
+    with profiler.phase('placement_candidates'):
+        candidates = placement_candidates(
+            ship, slots_needed, yard, cut_starts, cut_ends, rules,
+            expansions_first=getattr(score, 'expansions_first', False)
+        )
+
+    with profiler.phase('block_selection'):
+        chosen = select_placement(candidates, score, rng)
+    if chosen is None:
+        if not (candidates.block_lengths >= slots_needed).any():
+            if not_enough_slots():
+                return [], "Gagal: Tidak cukup slot valid yang tersedia (terblokir kapal lain)."
+            return [], "Gagal: Tidak ada blok tunggal yang cukup besar."
+        return [], "Gagal: Blok tersedia melanggar jarak internal."
+
+    if chosen < candidates.num_expansions:
+        cluster_idx, start_idx, prepend = candidates.expansion(chosen)
+        slots_to_fill = fill(cluster_idx, start_idx, prepend=prepend)
+        return slots_to_fill, f"Perluas Cluster #{cluster_idx+1}, target: {format_slot_list_to_string(slots_to_fill)}"
+
+    best_block_start = int(candidates.block_starts[chosen - candidates.num_expansions])
+    target_cluster_idx = -1
+    for i, cluster in enumerate(ship['clusters']):
+        if not cluster:
+            target_cluster_idx = i
+            break
+    
+    slots_preview = yard.slots_at(range(best_block_start, best_block_start + slots_needed))
+    if target_cluster_idx == -1:
+        if len(ship['clusters']) < ship['max_clusters']:
+            ship['clusters'].append([])
+            target_cluster_idx = len(ship['clusters']) - 1
+            recommendation = f"Buat Cluster Tambahan #{len(ship['clusters'])}, target: {format_slot_list_to_string(slots_preview)}"
+        else:
+            return [], "Gagal: Batas maksimal cluster tercapai."
+    else:
+        recommendation = f"Isi Cluster #{target_cluster_idx + 1}, target: {format_slot_list_to_string(slots_preview)}"
+
+    slots_to_fill = fill(target_cluster_idx, best_block_start)
+    return slots_to_fill, recommendation
@@ -0,0 +1,98 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class YardSnapshots(Mapping):
+    """Snapshot harian status yard yang disimpan sebagai delta.
+
+    Setiap ``keyframe_interval`` hari disimpan salinan penuh kepemilikan slot
+    (uint16 bila jumlah kapal memungkinkan); hari-hari lain hanya menyimpan slot
+    yang berubah (indeks + pemilik baru) terhadap hari sebelumnya. Status suatu
+    tanggal direkonstruksi dari keyframe terdekat lalu menerapkan delta-nya.
+
+    Berperilaku seperti ``{tanggal: {(area, nomor_slot): nama_kapal | None}}``
+    agar kompatibel dengan ``daily_yard_snapshots`` versi lama.
+    """
+
+    def __init__(self, yard, keyframe_interval=7):
+        self.yard = yard
+        self.keyframe_interval = keyframe_interval
+        self.dtype = np.uint16 if len(yard.vessel_names) <= np.iinfo(np.uint16).max else np.int32
+        self.dates = []
+        self._date_pos = {}
+        self._keyframes = {}
+        self._deltas = []
+        self._last = np.zeros(yard.total_slots, dtype=self.dtype)
+
+    def record(self, current_date, owner):
+        """Menyimpan status akhir hari ``current_date``."""
+        pos = len(self.dates)
+        owner = owner.astype(self.dtype, copy=False)
+        if pos % self.keyframe_interval == 0:
+            self._keyframes[pos] = owner.copy()
+            self._deltas.append(None)
+        else:
+            changed = np.flatnonzero(owner != self._last)
+            self._deltas.append((changed.astype(np.int32), owner[changed]))
+        self._last = owner.copy()
+        self.dates.append(current_date)
+        self._date_pos[current_date] = pos
+
+    def owner_on(self, current_date):
+        """Array id kapal per slot global pada akhir ``current_date``."""
+        pos = self._date_pos[current_date]
+        keyframe_pos = pos - pos % self.keyframe_interval
+        owner = self._keyframes[keyframe_pos].copy()
+        for changed, values in self._deltas[keyframe_pos + 1:pos + 1]:
+            owner[changed] = values
+        return owner
+
+    def head(self, n, yard=None):
+        """Snapshot baru berisi ``n`` hari pertama (array dipakai bersama, tidak disalin).
+
+        ``yard`` mengganti state yard acuan (mis. yard hasil restore checkpoint).
+        """
+        snapshots = YardSnapshots(yard or self.yard, self.keyframe_interval)
+        snapshots.dtype = self.dtype
+        snapshots.dates = self.dates[:n]
+        snapshots._date_pos = {current_date: pos for pos, current_date in enumerate(snapshots.dates)}
+        snapshots._keyframes = {pos: owner for pos, owner in self._keyframes.items() if pos < n}
+        snapshots._deltas = self._deltas[:n]
+        snapshots._last = self.owner_on(self.dates[n - 1]) if n else np.zeros(snapshots.yard.total_slots, dtype=self.dtype)
+        return snapshots
+
+    def iter_owners(self):
+        """Iterasi ``(tanggal, owner)`` berurutan dengan menerapkan delta secara inkremental.
+
+        Array ``owner`` dipakai ulang antar iterasi; salin jika perlu disimpan.
+        """
+        owner = None
+        for pos, current_date in enumerate(self.dates):
+            delta = self._deltas[pos]
+            if delta is None:
+                owner = self._keyframes[pos].copy()
+            else:
+                owner[delta[0]] = delta[1]
+            yield current_date, owner
+
+    def nbytes(self):
+        total = sum(k.nbytes for k in self._keyframes.values())
+        for delta in self._deltas:
+            if delta is not None:
+                total += delta[0].nbytes + delta[1].nbytes
+        return total
+
+    # --- Antarmuka Mapping ---
+
+    def __getitem__(self, current_date):
+        return self.yard.to_status_dict(self.owner_on(current_date))
+
+    def __iter__(self):
+        return iter(self.dates)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, current_date):
+        return current_date in self._date_pos
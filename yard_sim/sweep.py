@@ -0,0 +1,82 @@
+import itertools
+import warnings
+
+import pandas as pd
+
+from .parallel import map_parallel
+from .placement import DEFAULT_PLACEMENT_SCORE
+from .simulation import run_simulation
+
+# Urutan logika cluster dari paling ketat ke paling longgar.
+CLUSTER_LOGIC_ORDER = ['Wajar', 'Agresif']
+
+
+def rule_grid(intra_ship_gaps, daily_exclusion_zones, inter_ship_gaps,
+              cluster_req_logics=('Wajar',), ignored_vessel_sets=((),), placement_score=DEFAULT_PLACEMENT_SCORE):
+    """Semua kombinasi nilai aturan sebagai daftar dict ``sim_rules`` (fungsi skor blok sama untuk semua)."""
+    return [
+        {
+            'intra_ship_gap': int(intra),
+            'daily_exclusion_zone': int(exclusion),
+            'inter_ship_gap': int(inter),
+            'cluster_req_logic': logic,
+            'ignored_vessels': list(ignored),
+            'placement_score': placement_score,
+        }
+        for intra, exclusion, inter, logic, ignored in itertools.product(
+            intra_ship_gaps, daily_exclusion_zones, inter_ship_gaps,
+            cluster_req_logics, ignored_vessel_sets
+        )
+    ]
+
+
+def _run_combination(args, task):
+    df_schedule, df_trends, rule_level, seed, yard_config, slot_capacity = args
+    rules = task
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df_yor, df_recap, *_ = run_simulation(
+            df_schedule, df_trends, rules, rule_level, seed=seed, yard_config=yard_config, slot_capacity=slot_capacity
+        )
+    return {
+        'Jarak Internal Kapal': rules['intra_ship_gap'],
+        'Zona Eksklusif Harian': rules['daily_exclusion_zone'],
+        'Jarak Eksternal Kapal': rules['inter_ship_gap'],
+        'Logika Cluster': rules['cluster_req_logic'],
+        'Kapal Diabaikan': ", ".join(sorted(rules['ignored_vessels'])),
+        'Jumlah Kapal Diabaikan': len(rules['ignored_vessels']),
+        'Total Box Gagal': int(df_recap['Box Gagal'].sum()) if not df_recap.empty else 0,
+        'Kapal Gagal': int((df_recap['Box Gagal'] > 0).sum()) if not df_recap.empty else 0,
+        'Puncak YOR (%)': float(df_yor['Rasio Okupansi (%)'].max()) if not df_yor.empty else 0.0,
+        'Puncak Box di Yard': int(df_yor['Total Box di Yard'].max()) if not df_yor.empty else 0,
+    }
+
+
+def run_rule_sweep(df_schedule, df_trends, rules_list, rule_level="Sweep", seed=0, max_workers=None,
+                   yard_config=None, slot_capacity=None):
+    """Menjalankan simulasi penuh untuk setiap kombinasi aturan secara paralel.
+
+    Semua kombinasi memakai ``seed`` yang sama agar perbedaan hasil hanya berasal
+    dari aturan. Hasil diurutkan dari kombinasi paling ketat ke paling longgar,
+    dengan kolom ``Muat`` menandai kombinasi tanpa box gagal.
+    """
+    shared = (df_schedule, df_trends, rule_level, seed, yard_config, slot_capacity)
+    results = map_parallel(_run_combination, rules_list, shared, max_workers)
+    df_sweep = pd.DataFrame(results)
+    if df_sweep.empty:
+        return df_sweep
+    df_sweep['Muat'] = df_sweep['Total Box Gagal'] == 0
+    df_sweep['_logic_rank'] = df_sweep['Logika Cluster'].map(
+        {logic: i for i, logic in enumerate(CLUSTER_LOGIC_ORDER)}
+    ).fillna(len(CLUSTER_LOGIC_ORDER))
+    df_sweep = df_sweep.sort_values(
+        ['Jumlah Kapal Diabaikan', '_logic_rank', 'Jarak Internal Kapal', 'Zona Eksklusif Harian', 'Jarak Eksternal Kapal'],
+        ascending=[True, True, False, False, False], kind='stable'
+    )
+    return df_sweep.drop(columns='_logic_rank').reset_index(drop=True)
+
+
+def least_relaxed(df_sweep):
+    """Kombinasi paling ketat yang masih muat (tanpa box gagal), atau ``None``."""
+    fitting = df_sweep[df_sweep['Muat']] if not df_sweep.empty else df_sweep
+    return None if fitting.empty else fitting.iloc[0]
@@ -0,0 +1,98 @@
+import warnings
+
+import pandas as pd
+
+from .parallel import map_parallel
+from .simulation import run_simulation
+
+TERMINAL_COLUMN = 'TERMINAL'
+
+
+def terminal_schedule(df_schedule, name, column=TERMINAL_COLUMN):
+    """Baris jadwal milik terminal ``name``; jadwal tanpa kolom ``column`` dipakai utuh."""
+    if column not in df_schedule.columns:
+        return df_schedule
+    return df_schedule[df_schedule[column].astype(str).str.strip() == name]
+
+
+def split_schedule(df_schedule, layouts, column=TERMINAL_COLUMN):
+    """Memecah jadwal per terminal: ``{terminal: jadwal}`` (urutan mengikuti ``layouts``, terminal kosong dilewati).
+
+    Tanpa kolom ``column``, jadwal hanya boleh dipakai untuk satu layout.
+    """
+    if column not in df_schedule.columns:
+        if len(layouts) != 1:
+            raise ValueError(f"Kolom '{column}' dibutuhkan untuk membagi jadwal ke {len(layouts)} terminal.")
+        return {name: df_schedule for name in layouts}
+    terminals = df_schedule[column].astype(str).str.strip()
+    unknown = sorted(set(terminals) - set(layouts))
+    if unknown:
+        raise ValueError(f"Terminal di jadwal tidak ada di file layout: {', '.join(unknown)}")
+    return {name: df_schedule[terminals == name] for name in layouts if (terminals == name).any()}
+
+
+def _run_terminal(args, task):
+    df_trends, rules, rule_level, seed = args
+    name, df_schedule, layout = task
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return name, run_simulation(
+            df_schedule, df_trends, rules, rule_level, seed=seed,
+            yard_config=layout.yard_config, slot_capacity=layout.slot_capacity
+        )
+
+
+class MultiTerminalResult:
+    """Hasil simulasi per terminal (``results[terminal]`` = tuple ``run_simulation``) beserta ringkasan gabungan."""
+
+    def __init__(self, layouts, results):
+        self.layouts = layouts
+        self.results = results
+
+    def combined_yor(self):
+        """YOR harian gabungan (total box / total kapasitas box) dan YOR per terminal."""
+        boxes = pd.concat(
+            {name: result[0].set_index('Tanggal')['Total Box di Yard'] for name, result in self.results.items()}, axis=1
+        ).sort_index().fillna(0).astype('int64')
+        capacity = {name: self.layouts[name].capacity_boxes for name in self.results}
+        df_yor = pd.DataFrame({
+            'Tanggal': boxes.index,
+            'Total Box di Yard': boxes.sum(axis=1).to_numpy(),
+            'Kapasitas Box': sum(capacity.values()),
+        })
+        df_yor['Rasio Okupansi (%)'] = df_yor['Total Box di Yard'] / df_yor['Kapasitas Box'] * 100
+        for name in self.results:
+            df_yor[f'YOR {name} (%)'] = boxes[name].to_numpy() / capacity[name] * 100
+        return df_yor
+
+    def combined_recap(self):
+        """Rekap alokasi semua terminal dengan kolom ``Terminal``."""
+        return pd.concat(
+            [result[1].assign(Terminal=name) for name, result in self.results.items()], ignore_index=True
+        )[['Terminal', 'Kapal', 'Permintaan Box', 'Box Berhasil', 'Box Gagal']]
+
+    def terminal_summary(self):
+        """Satu baris per terminal: jumlah kapal, box gagal, dan puncak YOR."""
+        return pd.DataFrame([{
+            'Terminal': name,
+            'Jumlah Area': len(self.layouts[name].yard_config),
+            'Jumlah Slot': self.layouts[name].total_slots,
+            'Kapasitas Slot': self.layouts[name].slot_capacity,
+            'Jumlah Kapal': len(result[1]),
+            'Total Box Gagal': int(result[1]['Box Gagal'].sum()),
+            'Puncak YOR (%)': float(result[0]['Rasio Okupansi (%)'].max()),
+        } for name, result in self.results.items()])
+
+
+def run_terminals(df_schedule, df_trends, rules, rule_level, layouts, seed=None, max_workers=None,
+                  column=TERMINAL_COLUMN):
+    """Mensimulasikan jadwal setiap terminal dengan layout-nya sendiri secara paralel di process pool.
+
+    ``layouts`` adalah ``{terminal: YardLayout}`` (lihat :mod:`yard_sim.layouts`);
+    jadwal dibagi lewat kolom ``column``. ``max_workers=1`` menjalankan semua
+    terminal di proses saat ini.
+    """
+    schedules = split_schedule(df_schedule, layouts, column)
+    tasks = [(name, schedule, layouts[name]) for name, schedule in schedules.items()]
+    results = map_parallel(_run_terminal, tasks, (df_trends, rules, rule_level, seed), max_workers)
+    return MultiTerminalResult(layouts, dict(results))
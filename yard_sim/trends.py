@@ -0,0 +1,178 @@
+import hashlib
+import os
+import re
+import warnings
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STACKING_TREND_URL = 'https://github.com/irhassha/Clash_Analyzer/raw/refs/heads/main/stacking_trend.xlsx'
+# File tren yang ikut di repository; dipakai default agar tidak butuh akses internet.
+DEFAULT_TRENDS_PATH = Path(__file__).resolve().parent.parent / 'stacking_trends.xlsx'
+
+_DAY_COLUMN = re.compile(r'^DAY (\d+)$')
+# Tipe kunci SERVICE yang bisa disimpan di cache .npz (disimpan sebagai teks + tag tipe).
+_SERVICE_TYPES = {'int': int, 'float': float, 'str': str}
+
+
+def read_stacking_trends(source):
+    """Membaca tabel stacking trend (URL atau path file) dengan index SERVICE."""
+    df = pd.read_excel(source)
+    df.rename(columns={'STACKING TREND': 'SERVICE'}, inplace=True)
+    return df.set_index('SERVICE')
+
+
+class TrendMatrix:
+    """Tabel stacking trend yang sudah diparse menjadi matriks padat services x hari.
+
+    Nilai sudah dikonversi ke float (non-numerik/NaN menjadi 0) dan kolom ``DAY i``
+    yang tidak ada diisi 0, sehingga ``matrix[s, i]`` adalah persentase hari ke-i
+    service ``s``. Normalisasi ke total 1 dilakukan per lama stacking kapal karena
+    tren dipotong di hari ETD (lihat :meth:`daily_arrivals`).
+    """
+
+    def __init__(self, services, matrix):
+        self.services = list(services)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        self.service_index = {}
+        for i, service in enumerate(self.services):
+            self.service_index.setdefault(service, i)
+
+    @classmethod
+    def from_frame(cls, df_trends):
+        day_columns = {}
+        for col in df_trends.columns:
+            match = _DAY_COLUMN.match(str(col))
+            if match:
+                day_columns[int(match.group(1))] = col
+        num_days = max(day_columns) + 1 if day_columns else 0
+        matrix = np.zeros((len(df_trends), num_days))
+        for day, col in day_columns.items():
+            matrix[:, day] = pd.to_numeric(df_trends[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(df_trends.index, np.nan_to_num(matrix))
+
+    def to_frame(self):
+        columns = [f'DAY {i}' for i in range(self.matrix.shape[1])]
+        return pd.DataFrame(self.matrix, index=pd.Index(self.services, name='SERVICE'), columns=columns)
+
+    def __contains__(self, service_name):
+        return service_name in self.service_index
+
+    def daily_arrivals(self, total_boxes, service_names, num_days):
+        """Jumlah box harian untuk banyak kapal sekaligus.
+
+        Kapal dikelompokkan per lama stacking sehingga setiap kelompok dihitung
+        dengan satu operasi matriks. Service yang tidak dikenal memakai tren rata-rata.
+        """
+        total_boxes = np.asarray(total_boxes, dtype=np.int64)
+        num_days = np.asarray(num_days, dtype=np.int64)
+        rows = np.array([self.service_index.get(s, -1) for s in service_names], dtype=np.int64)
+        for service_name in np.asarray(service_names, dtype=object)[rows < 0]:
+            warnings.warn(f"Service '{service_name}' tidak ditemukan. Menggunakan tren rata-rata.")
+
+        width = self.matrix.shape[1]
+        result = [np.zeros(0, dtype=int)] * len(total_boxes)
+        for n in np.unique(num_days[num_days > 0]):
+            members = np.flatnonzero(num_days == n)
+            member_rows = rows[members]
+            known = member_rows >= 0
+
+            percentages = np.zeros((len(members), n))
+            take = min(n, width)
+            percentages[known, :take] = self.matrix[member_rows[known], :take]
+            percentages[~known] = 1.0 / n
+            sums = percentages.sum(axis=1)
+            positive = sums > 0
+            percentages[positive] = percentages[positive] / sums[positive, None]
+
+            member_totals = total_boxes[members]
+            daily_boxes = np.round(percentages * member_totals[:, None]).astype(int)
+            diff = member_totals - daily_boxes.sum(axis=1)
+            adjust = np.flatnonzero(diff != 0)
+            daily_boxes[adjust, daily_boxes[adjust].argmax(axis=1)] += diff[adjust]
+            for member, boxes in zip(members, daily_boxes):
+                result[member] = boxes
+        return result
+
+
+def as_trend_matrix(trends):
+    """Menerima ``TrendMatrix`` atau DataFrame stacking trend (index SERVICE)."""
+    return trends if isinstance(trends, TrendMatrix) else TrendMatrix.from_frame(trends)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_trend_matrix(source=None, cache_dir=None):
+    """Memuat ``TrendMatrix`` dari file lokal (default) atau URL.
+
+    Untuk file lokal, hasil parse disimpan sebagai cache biner ``.npz`` (di
+    ``cache_dir`` atau di samping file). Cache dipakai langsung bila mtime dan
+    ukuran file sama; bila berbeda, hash SHA-256 file dibandingkan dulu sebelum
+    Excel diparse ulang.
+    """
+    source = DEFAULT_TRENDS_PATH if source is None else source
+    if isinstance(source, str) and re.match(r'^[a-z]+://', source):
+        return TrendMatrix.from_frame(read_stacking_trends(source))
+
+    path = Path(source)
+    stat = path.stat()
+    cache_path = Path(cache_dir or path.parent) / f".{path.name}.trends.npz"
+    file_hash = None
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            meta = cached['meta']
+            if (int(meta[0]), int(meta[1])) != (stat.st_mtime_ns, stat.st_size):
+                file_hash = _file_sha256(path)
+                if str(cached['sha256']) != file_hash:
+                    raise ValueError('stale trend cache')
+            services = [_SERVICE_TYPES[tag](value) for value, tag in zip(cached['services'].tolist(),
+                                                                          cached['service_types'].tolist())]
+            trends = TrendMatrix(services, cached['matrix'])
+        if file_hash is not None:
+            _save_trend_cache(cache_path, trends, stat, file_hash)
+        return trends
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        pass
+
+    trends = TrendMatrix.from_frame(read_stacking_trends(path))
+    _save_trend_cache(cache_path, trends, stat, file_hash or _file_sha256(path))
+    return trends
+
+
+def _service_type(service):
+    if isinstance(service, (bool, np.bool_)):
+        return None
+    if isinstance(service, (int, np.integer)):
+        return 'int'
+    if isinstance(service, (float, np.floating)):
+        return 'float'
+    return 'str' if isinstance(service, str) else None
+
+
+def _save_trend_cache(cache_path, trends, stat, file_hash):
+    # Kunci SERVICE disimpan beserta tipenya agar kode numerik (mis. 101) tetap cocok setelah dimuat ulang.
+    service_types = [_service_type(s) for s in trends.services]
+    if None in service_types:
+        return
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp.npz")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            tmp_path,
+            services=np.array([str(s) for s in trends.services]),
+            service_types=np.array(service_types),
+            matrix=trends.matrix,
+            meta=np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64),
+            sha256=np.array(file_hash),
+        )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,97 @@
+"""View-model tampilan yard harian, dihitung sekali setelah simulasi selesai."""
+
+import numpy as np
+import pandas as pd
+
+
+def _operational_window(vessels, vessel_names):
+    """Hari mulai & akhir operasional (ns, dinormalisasi) per id kapal, seperti panel Ringkasan Area."""
+    num_ids = len(vessel_names)
+    start = np.full(num_ids, np.iinfo(np.int64).max, dtype=np.int64)
+    end = np.full(num_ids, np.iinfo(np.int64).min, dtype=np.int64)
+    for ship in vessels.values():
+        vid = ship['vessel_id']
+        start[vid] = (ship['eta_date'] - pd.Timedelta(hours=8)).normalize().value
+        end[vid] = ship['etd_date'].normalize().value
+    return start, end
+
+
+def _format_numbers(numbers):
+    """``[1, 2, 3, 7]`` -> ``"1-3, 7"`` (nomor slot terurut)."""
+    numbers = np.asarray(numbers)
+    breaks = np.flatnonzero(np.diff(numbers) != 1) + 1
+    parts = []
+    for group in np.split(numbers, breaks):
+        start, end = int(group[0]), int(group[-1])
+        parts.append(f"{start}" if start == end else f"{start}-{end}")
+    return ", ".join(parts)
+
+
+class YardViewModel:
+    """Ringkasan per tanggal & area untuk panel "Visualisasi Yard Harian".
+
+    Untuk setiap tanggal snapshot menyimpan, per area: jumlah slot terpakai,
+    rentang slot tiap kapal (``[(kapal, "1-5, 9")]`` terurut nama kapal), dan
+    kapal di area itu yang sedang operasional (calon restriksi; filter kapal
+    yang diabaikan dilakukan saat render). Log harian dikelompokkan per tanggal
+    sekali sehingga geser slider hanya berupa lookup.
+    """
+
+    def __init__(self, snapshots, vessels, df_daily_log):
+        yard = snapshots.yard
+        self.areas = list(yard.areas)
+        self.area_sizes = yard.area_sizes.tolist()
+        self.dates = list(snapshots.dates)
+        self._summaries = {}
+        self._logs = {}
+
+        names = yard.vessel_names
+        op_start, op_end = _operational_window(vessels, names)
+        boundary = np.zeros(yard.total_slots, dtype=bool)
+        boundary[yard.area_offsets[yard.area_sizes > 0]] = True
+
+        for current_date, owner in snapshots.iter_owners():
+            day_value = current_date.normalize().value
+            active = (op_start <= day_value) & (day_value <= op_end)
+            occupied = np.bincount(yard.slot_area[owner > 0], minlength=len(self.areas))
+
+            # Slot terpakai dikelompokkan per (area, kapal) lewat satu pengurutan stabil.
+            taken = np.flatnonzero(owner)
+            order = np.lexsort((taken, owner[taken], yard.slot_area[taken]))
+            taken = taken[order]
+            keys_area, keys_owner = yard.slot_area[taken], owner[taken].astype(np.int64)
+            group_breaks = np.flatnonzero((np.diff(keys_area) != 0) | (np.diff(keys_owner) != 0)) + 1
+
+            per_area = [[] for _ in self.areas]
+            restricting = [[] for _ in self.areas]
+            for group in np.split(np.arange(len(taken)), group_breaks):
+                if not len(group):
+                    continue
+                area, vid = int(keys_area[group[0]]), int(keys_owner[group[0]])
+                per_area[area].append((names[vid], _format_numbers(yard.slot_number[taken[group]])))
+                if active[vid]:
+                    restricting[area].append(names[vid])
+
+            self._summaries[current_date] = [{
+                'area': area, 'size': size, 'occupied': int(occupied[i]),
+                'vessels': sorted(per_area[i], key=lambda item: item[0]),
+                'active_vessels': frozenset(restricting[i]),
+            } for i, (area, size) in enumerate(zip(self.areas, self.area_sizes))]
+
+        # Baris pertama tiap kapal per tanggal, urutan kemunculan sama seperti filter lama.
+        if not df_daily_log.empty:
+            first_rows = df_daily_log.drop_duplicates(['Tanggal', 'Kapal'])
+            for date_label, df in first_rows.groupby('Tanggal', observed=True, sort=False):
+                self._logs[str(date_label)] = df
+
+    def area_summaries(self, current_date):
+        return self._summaries[current_date]
+
+    @staticmethod
+    def restricting_vessels(summary, ignored_vessels=()):
+        """Kapal operasional di area yang tidak diabaikan, terurut nama."""
+        return sorted(summary['active_vessels'].difference(ignored_vessels))
+
+    def daily_plan(self, current_date):
+        """Baris log (satu per kapal) untuk ``current_date``; DataFrame kosong jika tidak ada aktivitas."""
+        return self._logs.get(current_date.strftime('%Y-%m-%d'), pd.DataFrame())
@@ -0,0 +1,169 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .aggregation import DAILY_LOG_COLUMNS
+from .blocking import BlockingIndex
+from .checkpoints import SimulationCheckpoints
+from .events import operational_start_date
+from .simulation import run_simulation
+from .trends import as_trend_matrix
+
+WHATIF_COLUMNS = [column for column in DAILY_LOG_COLUMNS if column != 'Kapal'] + ['Slot Kosong', 'Diblokir Oleh']
+
+
+class FeasibilityResult:
+    """Hasil cek kelayakan satu kapal kandidat.
+
+    ``failed_boxes`` adalah box kandidat yang sampai ETD tetap tidak mendapat
+    slot (defisit akhir, bukan jumlah ``Box Gagal Harian`` yang terbawa antar
+    hari). ``affected_vessels`` adalah kapal jadwal yang box gagalnya bertambah
+    karena kandidat.
+    """
+
+    def __init__(self, vessel, daily, failed_boxes, affected_vessels=()):
+        self.vessel = vessel
+        self.daily = daily
+        self.failed_boxes = int(failed_boxes)
+        self.feasible = self.failed_boxes == 0
+        failed = daily['Box Gagal Harian'] > 0
+        self.feasible_days = list(daily.loc[(daily['Butuh Slot'] > 0) & ~failed, 'Tanggal'])
+        self.infeasible_days = list(daily.loc[failed, 'Tanggal'])
+        blockers = set()
+        for names in daily['Diblokir Oleh']:
+            blockers.update(names)
+        self.blocking_vessels = sorted(blockers)
+        self.affected_vessels = sorted(affected_vessels)
+
+    def summary(self):
+        return {
+            'Kapal': self.vessel['name'], 'Permintaan Box': self.vessel['total_boxes'],
+            'Box Gagal': self.failed_boxes, 'Layak': self.feasible,
+            'Hari Gagal': len(self.infeasible_days), 'Diblokir Oleh': ", ".join(self.blocking_vessels),
+            'Kapal Terdampak': ", ".join(self.affected_vessels),
+        }
+
+
+def _blocking_at(yard, rules, owner, vessels, current_date):
+    """Indeks blokir kapal operasional pada ``current_date``, direkonstruksi dari run slot kontigu per kapal di ``owner``."""
+    blocking = BlockingIndex(yard, rules)
+    taken = np.flatnonzero(owner)
+    breaks = np.flatnonzero((np.diff(taken) != 1) | (np.diff(owner[taken]) != 0)
+                            | (np.diff(yard.slot_area[taken]) != 0)) + 1
+    clusters = {}
+    for run in np.split(taken, breaks) if len(taken) else []:
+        clusters.setdefault(int(owner[run[0]]), []).append(yard.slots_at(run))
+    for ship in vessels.values():
+        blocking_from = max(ship['start_date'], operational_start_date(ship))
+        if blocking_from <= current_date <= ship['etd_date'] and ship['vessel_id'] in clusters:
+            blocking.activate(dict(ship, clusters=clusters[ship['vessel_id']]))
+    return blocking
+
+
+class FeasibilityIndex:
+    """Query what-if: apakah kapal tambahan muat jika ditambahkan ke jadwal?
+
+    Kandidat ditambahkan di akhir jadwal lalu simulasi dilanjutkan dari
+    checkpoint terakhir sebelum open stacking-nya (lihat
+    :class:`yard_sim.checkpoints.SimulationCheckpoints`), sehingga hasilnya sama
+    persis dengan menjalankan ulang jadwal + kandidat, termasuk efeknya ke kapal
+    lain. Checkpoint jadwal dasar dibuat sekali saat query pertama, dilanjutkan
+    dari salinan ``checkpoints`` bila inputnya cocok; store tersebut tidak diubah.
+
+    ``Diblokir Oleh`` pada hari gagal adalah kapal yang zonanya menutup slot
+    kosong di status akhir hari tersebut; ``Slot Kosong`` adalah jumlah slot
+    kosong saat itu (nol berarti yard penuh, bukan terblokir).
+    """
+
+    def __init__(self, df_schedule, trends, rules, rule_level=None, seed=0, yard_config=None, slot_capacity=None,
+                 checkpoints=None):
+        if seed is None:
+            raise ValueError("Cek kelayakan butuh seed tetap agar simulasi bisa dilanjutkan dari checkpoint.")
+        self.df_schedule = df_schedule
+        self.trends = as_trend_matrix(trends)
+        self.rules = rules
+        self.rule_level = rule_level
+        self.seed = seed
+        self.layout = {'yard_config': yard_config, 'slot_capacity': slot_capacity}
+        self._checkpoints = checkpoints
+        self._base = None
+        self._base_failed = None
+
+    @classmethod
+    def from_checkpoints(cls, checkpoints):
+        """Dari ``SimulationCheckpoints`` run terakhir; jadwal, tren, aturan, seed, dan layout diambil dari inputnya."""
+        inputs = checkpoints.inputs
+        names = list(inputs['vessels'])
+        signatures = list(inputs['vessels'].values())
+        df_schedule = pd.DataFrame({
+            'VESSEL': names,
+            'SERVICE': [s[0] for s in signatures],
+            'TOTAL BOX (TEUS)': [s[1] for s in signatures],
+            'OPEN STACKING': pd.to_datetime([s[2] for s in signatures]),
+            'ETA': pd.to_datetime([s[3] for s in signatures]),
+            'ETD': pd.to_datetime([s[4] for s in signatures]),
+        })
+        rules = dict(inputs['rules'], ignored_vessels=sorted(inputs['ignored_vessels']))
+        return cls(df_schedule, inputs['trends'], rules, seed=inputs['seed'], yard_config=inputs['yard_config'],
+                   slot_capacity=inputs['slot_capacity'], checkpoints=checkpoints)
+
+    def _run(self, df_schedule, checkpoints):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return run_simulation(df_schedule, self.trends, self.rules, self.rule_level, seed=self.seed,
+                                  checkpoints=checkpoints, **self.layout)
+
+    def _prepare(self):
+        if self._base is None:
+            base = self._checkpoints.fork() if self._checkpoints is not None else SimulationCheckpoints()
+            df_recap = self._run(self.df_schedule, base)[1]
+            self._base_failed = dict(zip(df_recap['Kapal'], df_recap['Box Gagal']))
+            self._base = base
+        return self._base
+
+    # --- Query ---
+
+    def check(self, name, total_boxes, open_stacking, eta, etd, service=None):
+        """Mensimulasikan ulang jadwal + kapal kandidat dari checkpoint terdekat."""
+        if name in set(self.df_schedule['VESSEL']):
+            raise ValueError(f"Kapal '{name}' sudah ada di jadwal.")
+        if service not in self.trends:
+            warnings.warn(f"Service '{service}' tidak ditemukan. Menggunakan tren rata-rata.")
+        candidate_row = pd.DataFrame({
+            'VESSEL': [name], 'SERVICE': [service], 'TOTAL BOX (TEUS)': [int(total_boxes)],
+            'OPEN STACKING': [pd.Timestamp(open_stacking)], 'ETA': [pd.Timestamp(eta)], 'ETD': [pd.Timestamp(etd)],
+        })
+        df_schedule = pd.concat([self.df_schedule, candidate_row], ignore_index=True)
+        _, df_recap, _, df_daily_log, snapshots, vessels = self._run(df_schedule, self._prepare().fork())
+        ship = vessels[name]
+
+        daily = df_daily_log[df_daily_log['Kapal'] == name].drop(columns='Kapal').reset_index(drop=True)
+        daily['Tanggal'] = pd.to_datetime(daily['Tanggal'].astype(str))
+        owners = [snapshots.owner_on(current_date) for current_date in daily['Tanggal']]
+        daily['Slot Kosong'] = [int((owner == 0).sum()) for owner in owners]
+        ignored = set(self.rules.get('ignored_vessels', []))
+        blocking_vessels = {n: s for n, s in vessels.items() if n not in ignored}
+        names = snapshots.yard.vessel_names
+        daily['Diblokir Oleh'] = [
+            sorted(names[v] for v in _blocking_at(snapshots.yard, self.rules, owner, blocking_vessels, current_date)
+                   .blockers(ship, owner == 0))
+            if slots_failed > 0 else []
+            for owner, current_date, slots_failed in zip(owners, daily['Tanggal'], daily['Slot Gagal'])
+        ]
+
+        failed_after = dict(zip(df_recap['Kapal'], df_recap['Box Gagal']))
+        affected = [n for n, failed in self._base_failed.items() if failed_after.get(n, failed) > failed]
+        return FeasibilityResult(ship, daily[WHATIF_COLUMNS], max(0, -ship['remaining_capacity']), affected)
+
+    def scan_open_dates(self, name, total_boxes, open_stacking, eta, etd, service=None, shifts=range(-3, 4)):
+        """Cek kelayakan jika seluruh jadwal kandidat digeser ``shifts`` hari; satu baris per pergeseran."""
+        rows = []
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for shift in shifts:
+                offset = pd.Timedelta(days=shift)
+                result = self.check(name, total_boxes, pd.Timestamp(open_stacking) + offset,
+                                    pd.Timestamp(eta) + offset, pd.Timestamp(etd) + offset, service)
+                rows.append({'Geser (hari)': shift, 'Buka Stacking': result.vessel['start_date'], **result.summary()})
+        return pd.DataFrame(rows)